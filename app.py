@@ -1,80 +1,45 @@
 import streamlit as st
 import streamlit.components.v1 as components
-import requests
-import re
 from datetime import datetime, timedelta, date, timezone
-import google.generativeai as genai
 import concurrent.futures
+import threading
+import time
 import urllib.parse
+import newsapi
+import prompt_builder
+from topics import DEFAULT_TOPICS
+from pipeline import articles_fingerprint, build_topic_index, select_by_topics
+from rendering import CARD_CSS, iter_card_batches, md_to_html, render_markdown
+from sources import SOURCE_MAPPING, REVERSE_MAPPING, DEFAULT_SOURCES
+from news_pipeline import NewsPipeline, default_date_window, next_day_start, summary_date_context, setting_flag
+from metrics import to_jsonl, to_prometheus
+from warmer import CacheWarmer
 
 # --- CONFIGURATION ---
-NEWS_API_KEYS = [
-    st.secrets["NEWS_API_KEY_1"],
-    st.secrets["NEWS_API_KEY_2"],
-    st.secrets["NEWS_API_KEY_3"],
-]
-GEMINI_API_KEY = st.secrets["GEMINI_API_KEY"]
-
-# Initialize Gemini
-genai.configure(api_key=GEMINI_API_KEY)
-
-SOURCE_MAPPING = {
-    'reuters': 'Reuters',
-    'associated-press': 'Associated Press',
-    'bloomberg': 'Bloomberg',
-    'axios': 'Axios',
-    'politico': 'Politico',
-    'the-verge': 'The Verge',
-    'bbc-news': 'BBC News',
-    'al-jazeera-english': 'Al Jazeera',
-    'the-wall-street-journal': 'WSJ',
-    'cnbc': 'CNBC',
-    'business-insider': 'Business Insider',
-    'financial-post': 'Financial Post',
-    'techcrunch': 'TechCrunch',
-    'wired': 'Wired',
-    'ars-technica': 'Ars Technica',
-    'hacker-news': 'Hacker News'
-}
-REVERSE_MAPPING = {v: k for k, v in SOURCE_MAPPING.items()}
-NEUTRAL_SOURCES = ['reuters', 'associated-press', 'bloomberg', 'axios', 'politico']
-
-DEFAULT_TOPICS = [
-    "Tech", "AI", "Stocks", "Politics", "Epstein", "Nuclear"
-]
-
-# --- KEYWORD EXPANSION ---
-TOPIC_KEYWORDS = {
-    "Tech": [
-        "tech", "technology", "software", "hardware", "startup",
-        "silicon valley", "app", "semiconductor", "cybersecurity", "cloud computing"
-    ],
-    "AI": [
-        "ai", "artificial intelligence", "machine learning", "llm",
-        "openai", "chatgpt", "deep learning", "neural network",
-        "anthropic", "gemini", "large language model", "generative ai"
-    ],
-    "Stocks": [
-        "stocks", "stock market", "equities", "s&p", "nasdaq",
-        "dow jones", "shares", "earnings", "ipo", "wall street",
-        "federal reserve", "interest rates", "hedge fund", "market rally"
-    ],
-    "Politics": [
-        "politics", "election", "congress", "senate",
-        "house of representatives", "white house", "legislation",
-        "biden", "trump", "democrat", "republican", "gop",
-        "governor", "ballot", "campaign", "executive order"
-    ],
-    "Epstein": [
-        "epstein", "jeffrey epstein", "ghislaine maxwell",
-        "epstein files", "epstein list"
-    ],
-    "Nuclear": [
-        "nuclear", "uranium", "reactor", "warhead",
-        "nonproliferation", "iaea", "fission", "nuclear weapon",
-        "nuclear energy", "nuclear deal", "enrichment"
-    ],
-}
+# Fetch, processing and summary settings (API keys, engines, budgets) are
+# read from st.secrets by NewsPipeline; these only affect the UI.
+FEED_PAGE_SIZE = 30
+# Per-topic fetches are cached this long
+FETCH_CACHE_TTL = timedelta(hours=6)
+# Background refresh of the default view (and its brief summary), at
+# startup, CACHE_WARM_LEAD_MIN minutes before its cached fetches expire and
+# just after midnight
+CACHE_WARMER = setting_flag(st.secrets, "CACHE_WARMER", "true")
+CACHE_WARM_SUMMARY = setting_flag(st.secrets, "CACHE_WARM_SUMMARY", "true")
+CACHE_WARM_LEAD_MIN = int(st.secrets.get("CACHE_WARM_LEAD_MIN", 10))
+# Render the AI Overview as it is generated instead of after the full response
+SUMMARY_STREAMING = setting_flag(st.secrets, "SUMMARY_STREAMING", "true")
+# Debug panel in the sidebar for every session; otherwise only with ?debug=1.
+# Stage timings in it are recorded when METRICS is set.
+DEBUG_PANEL = setting_flag(st.secrets, "DEBUG_PANEL", "false")
+
+
+@st.cache_resource
+def get_pipeline():
+    """Process-wide pipeline: key scheduler, article store, summary cache and
+    single-flight groups shared by every session."""
+    return NewsPipeline(st.secrets)
+
 
 # --- INITIALIZE SESSION STATE ---
 if 'saved_custom_topics' not in st.session_state:
@@ -87,11 +52,8 @@ if 'applied_topics' not in st.session_state:
     st.session_state.applied_topics = DEFAULT_TOPICS.copy()
 
 if 'applied_start_date' not in st.session_state:
-    current_utc = datetime.now(timezone.utc)
-    today = (current_utc - timedelta(hours=5)).date()
-    st.session_state.applied_start_date = today - timedelta(days=1)
-    st.session_state.applied_end_date = today
-    st.session_state.applied_sources = [src for src in SOURCE_MAPPING.keys() if src not in ('wired', 'hacker-news', 'ars-technica')]
+    st.session_state.applied_start_date, st.session_state.applied_end_date = default_date_window()
+    st.session_state.applied_sources = DEFAULT_SOURCES.copy()
 
 if 'ai_summary_text' not in st.session_state:
     st.session_state.ai_summary_text = None
@@ -102,122 +64,218 @@ if 'summary_mode' not in st.session_state:
 
 # --- FUNCTIONS ---
 
-def build_api_query(topic):
-    keywords = TOPIC_KEYWORDS.get(topic, [topic.lower()])
-    capped_keywords = keywords[:5]
-    return " OR ".join(f'"{kw}"' for kw in capped_keywords)
+# Per-thread fetch state: `missed` is set when fetch_topic_articles' body runs
+# (a cache miss) and `probe` makes a miss raise instead of fetching.
+_fetch_context = threading.local()
 
 
-@st.cache_data(ttl=timedelta(hours=6), show_spinner=False)
-def fetch_news_parallel(topics, sources, from_date, to_date):
-    if not topics:
-        topics = ["General"]
+class TopicNotCached(Exception):
+    pass
 
-    all_articles = []
+
+@st.cache_data(ttl=FETCH_CACHE_TTL, show_spinner=False)
+def fetch_topic_articles(topic, sources, from_date, to_date):
+    """Fetch one topic from NewsAPI. Cached per (topic, sources, dates) so the
+    merged feed can be rebuilt from cached pieces when the topic set changes.
+    Past days already in the article store are served from disk."""
+    _fetch_context.missed = True
+    if getattr(_fetch_context, 'probe', False):
+        # Raising keeps the miss out of the cache
+        raise TopicNotCached(topic)
+    # Sessions missing the same topic at once share one fetch
+    return get_pipeline().fetch_topic(topic, sources, from_date, to_date)
+
+
+def fetch_topics_threaded(topics, sources, from_date, to_date):
+    metrics = get_pipeline().metrics
 
     def fetch_single_topic(topic):
-        url = "https://newsapi.org/v2/everything"
-        params = {
-            'q': build_api_query(topic),
-            'searchIn': 'title,description',
-            'sources': ','.join(sources) if sources else '',
-            'from': from_date.strftime('%Y-%m-%d'),
-            'to': to_date.strftime('%Y-%m-%d'),
-            'language': 'en',
-            'sortBy': 'publishedAt',
-            'pageSize': 100,
-        }
-        for api_key in NEWS_API_KEYS:
-            try:
-                response = requests.get(url, params={**params, 'apiKey': api_key})
-                data = response.json()
-                if data.get('status') == 'ok':
-                    return data.get('articles', [])
-            except:
-                pass
-        return []
+        _fetch_context.missed = False
+        articles = fetch_topic_articles(topic, sources, from_date, to_date)
+        metrics.incr('fetch_cache_misses' if _fetch_context.missed else 'fetch_cache_hits')
+        return articles
 
     with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-        results = executor.map(fetch_single_topic, topics)
+        return list(executor.map(fetch_single_topic, topics))
+
+
+def fetch_topics_async(topics, sources, from_date, to_date):
+    """Probe the per-topic cache, run every request the missing topics need on
+    one event loop, then fill the cache from those prefetched responses."""
+    pipeline = get_pipeline()
+    results = {}
+    missing_topics = []
+
+    _fetch_context.probe = True
+    try:
+        for topic in topics:
+            try:
+                results[topic] = fetch_topic_articles(topic, sources, from_date, to_date)
+            except TopicNotCached:
+                missing_topics.append(topic)
+    finally:
+        _fetch_context.probe = False
+
+    if missing_topics:
+        plans = pipeline.plan_topics(missing_topics, sources, from_date, to_date)
+        responses = pipeline.prefetch_requests(pipeline.planned_requests(plans))
+        with pipeline.prefetched(plans, responses):
+            for topic in missing_topics:
+                results[topic] = fetch_topic_articles(topic, sources, from_date, to_date)
 
+    pipeline.metrics.incr('fetch_cache_hits', len(topics) - len(missing_topics))
+    pipeline.metrics.incr('fetch_cache_misses', len(missing_topics))
+
+    return [results[topic] for topic in topics]
+
+
+def refresh_topics(topics, sources, from_date, to_date):
+    """Replace the cached fetches of ``topics`` before they expire.
+
+    Every request is made first; each topic's entry is then cleared and
+    refilled from the prefetched responses, so a session never finds the
+    entry missing for longer than a store lookup. Returns the merged
+    articles, newest first.
+    """
+    pipeline = get_pipeline()
+    topics = list(dict.fromkeys(topics))
+    sources = tuple(sorted(sources))
+
+    plans = pipeline.plan_topics(topics, sources, from_date, to_date)
+    responses = pipeline.prefetch_requests(pipeline.planned_requests(plans))
+    all_articles = []
+    with pipeline.prefetched(plans, responses):
+        for topic in topics:
+            fetch_topic_articles.clear(topic, sources, from_date, to_date)
+            all_articles.extend(fetch_topic_articles(topic, sources, from_date, to_date))
+
+    all_articles.sort(key=lambda x: x.published_at, reverse=True)
+    return all_articles
+
+
+def fetch_news_parallel(topics, sources, from_date, to_date):
+    if not topics:
+        topics = ["General"]
+
+    # Normalize so reordering topics or sources still hits the per-topic cache
+    topics = list(dict.fromkeys(topics))
+    sources = tuple(sorted(sources))
+
+    if get_pipeline().fetch_engine == "asyncio":
+        results = fetch_topics_async(topics, sources, from_date, to_date)
+    else:
+        results = fetch_topics_threaded(topics, sources, from_date, to_date)
+
+    all_articles = []
     for res in results:
         all_articles.extend(res)
 
-    valid_articles = [a for a in all_articles if a.get('title') and a['title'] != "[Removed]"]
-    valid_articles.sort(key=lambda x: x['publishedAt'], reverse=True)
-
-    return valid_articles
-
-
-def classify_article(text, applied_topics):
-    found_tags = []
-    text_lower = text.lower()
-
-    for topic in applied_topics:
-        keywords = TOPIC_KEYWORDS.get(topic, [topic.lower()])
-        for kw in keywords:
-            if re.search(rf'\b{re.escape(kw)}\b', text_lower):
-                found_tags.append(topic)
-                break
-
-    return list(dict.fromkeys(found_tags))
-
-
-OPINION_SIGNALS = [
-    r'\bopinion\b', r'\beditorial\b', r'\bop-ed\b', r'\boped\b',
-    r'\bcolumn\b', r'\bcolumnist\b', r'\bcommentary\b',
-    r'\bperspective\b', r'\banalysis\b', r'\bletter to the editor\b',
-    r'\breview[:\s]', r'\ba sharp take\b', r'\btake on\b',
-    r'\bwhy you should\b', r'\bwhy i\b', r'\bhere\'s why\b',
-    r'\bwhat .+ gets (right|wrong)\b', r'\bthe case (for|against)\b',
-    r'\bshould you\b', r'\bworth watching\b', r'\bworth reading\b',
-    r'\bfirst look\b', r'\bhands-on\b', r'\bhands on\b',
-    r'\bi think\b', r'\bin my view\b', r'\bin my opinion\b',
-    r'\brant\b', r'\bhot take\b', r'\bunpopular opinion\b',
-]
-
-def is_opinion_article(title, description):
-    """Check if an article is likely an opinion/editorial/review piece."""
-    text = f"{title} {description}".lower()
-    for pattern in OPINION_SIGNALS:
-        if re.search(pattern, text):
-            return True
-    return False
-
-
-@st.cache_data(show_spinner=False)
-def get_gemini_summary(prompt_data_string, date_context, summary_mode="brief"):
-    if not prompt_data_string.strip():
-        return "No articles available to summarize."
-
-    if summary_mode == "brief":
-        style_instructions = """Provide a concise executive briefing.
-For each category, use a ## header with the category name, then write 2-4 bullet points capturing the most important developments.
-Each bullet should be one clear, informative sentence. Bold key names, companies, and figures.
-Keep the entire summary focused and scannable. Use markdown formatting (## headers, bullet points, **bold**) for readability."""
-    else:
-        style_instructions = """Provide a DETAILED, comprehensive briefing. 
-For each category, use a ## header with the category name, then cover all major stories with context, implications, and relevant details. 
-Use bullet points for individual stories with **bold** lead-ins. Include sub-bullets where appropriate.
-Be thorough but stay organized and readable. Use markdown formatting (## headers, bullet points, **bold**) for readability."""
+    all_articles.sort(key=lambda x: x.published_at, reverse=True)
+
+    return all_articles
+
+
+def fetch_cache_hit_rate(counters):
+    hits, misses = counters.get('fetch_cache_hits', 0), counters.get('fetch_cache_misses', 0)
+    total = hits + misses
+    return (hits / total if total else 0.0), hits, misses
+
+
+def warm_default_view():
+    """Refresh the view a new session opens on, and pre-generate its brief summary."""
+    pipeline = get_pipeline()
+    from_date, to_date = default_date_window()
+    requests_before = newsapi.STATS.snapshot()['requests']
+    quota_before = sum(k['used_today'] for k in pipeline.scheduler.health())
+
+    fetch_started = time.perf_counter()
+    raw_articles = refresh_topics(DEFAULT_TOPICS, DEFAULT_SOURCES, from_date, to_date)
+    details = {'articles': len(raw_articles), 'fetch_s': time.perf_counter() - fetch_started}
+
+    if CACHE_WARM_SUMMARY and raw_articles:
+        summary_started = time.perf_counter()
+        processed_articles, _ = pipeline.process(raw_articles, DEFAULT_TOPICS, True)
+        summary_plan, _ = pipeline.plan_summary(processed_articles, DEFAULT_TOPICS)
+        summary_timing = {}
+        "".join(pipeline.generate_summary(
+            summary_plan, summary_date_context(from_date, to_date), "brief", summary_timing, SUMMARY_STREAMING))
+        details['summary_s'] = time.perf_counter() - summary_started
+        details['summary_cached'] = summary_timing.get('cached', False)
+
+    # Includes any user fetches that ran at the same time
+    details['requests'] = newsapi.STATS.snapshot()['requests'] - requests_before
+    details['quota_used'] = max(sum(k['used_today'] for k in pipeline.scheduler.health()) - quota_before, 0)
+    return details
+
+
+def describe_warmer(warmer):
+    """Sidebar caption line for the cache warmer, starting with a line break."""
+    if warmer is None:
+        return ""
+    status = warmer.status()
+    last_run = status['last_run']
+    if last_run is None:
+        return "  \nWarmer: first run in progress"
+    line = (
+        f"  \nWarmer: last run {last_run['started_at']:%H:%M} UTC, {last_run['duration_s']:.1f} s"
+        f" (fetch {last_run.get('fetch_s', 0):.1f} s"
+    )
+    if 'summary_s' in last_run:
+        line += f", summary {last_run['summary_s']:.1f} s"
+    line += f"), {last_run.get('requests', 0)} requests, {last_run.get('quota_used', 0)} quota"
+    if last_run['error']:
+        line += f", failed: {last_run['error']}"
+    if status['next_run']:
+        line += f", next {datetime.fromtimestamp(status['next_run'], timezone.utc):%H:%M} UTC"
+    return line
+
+
+def render_debug_panel(pipeline, warmer):
+    """Caches, upstreams and stage timings, with the same data as an export."""
+    snapshot = pipeline.metrics.snapshot()
+    counters = snapshot['counters']
+    hit_rate, cache_hits, cache_misses = fetch_cache_hit_rate(counters)
+    st.caption(
+        f"Fetch cache: {hit_rate:.0%} hit rate ({cache_hits} hits, {cache_misses} misses)  \n"
+        f"NewsAPI: {counters['newsapi_requests']} requests, {counters['newsapi_retries']} retries, "
+        f"p50 {counters['newsapi_p50_ms']:.0f} ms, p95 {counters['newsapi_p95_ms']:.0f} ms  \n"
+        f"API keys: {counters['newsapi_keys_healthy']}/{len(pipeline.scheduler.api_keys)} healthy, "
+        f"{counters['newsapi_quota_remaining']} requests left today  \n"
+        f"Summary cache: {counters['summary_cache_hits']} hits, {counters['summary_cache_misses']} misses, "
+        f"{counters['summary_cache_entries']} entries ({counters['summary_cache_bytes'] / 1024:.0f} KiB)  \n"
+        f"Coalesced: {counters['coalesced_requests']} requests, {counters['coalesced_summaries']} summaries"
+        + describe_warmer(warmer)
+    )
 
-    try:
-        model = genai.GenerativeModel('gemini-3-flash-preview')
-        prompt = f'''You are a professional news briefing assistant. 
-The following news articles were published between {date_context}.
-I am providing you with a list of current news articles. Each article includes its assigned Categories, Title, and Description.
+    if snapshot['stages']:
+        st.caption("  \n".join(
+            f"`{stage}` p50 {stats['p50_ms']:.0f} ms · p95 {stats['p95_ms']:.0f} ms · max {stats['max_ms']:.0f} ms ({stats['count']})"
+            for stage, stats in sorted(snapshot['stages'].items(), key=lambda item: -item[1]['p50_ms'])
+        ))
+    elif not pipeline.metrics.enabled:
+        st.caption("Stage timings are off; set `METRICS = true` to record them.")
+
+    opinion_stats = pipeline.opinion_detector.stats()
+    st.caption(
+        f"Opinion filter: {opinion_stats['checked']} articles checked, {opinion_stats['memo_hits']} served from memo  \n"
+        + "  \n".join(
+            f"`{signal}` — {hits}" if hits else f"`{signal}` — never fired"
+            for signal, hits in opinion_stats['signals']
+        )
+    )
 
-{style_instructions}
+    col_prom, col_jsonl = st.columns(2)
+    col_prom.download_button("Prometheus", to_prometheus(snapshot), "metrics.prom", "text/plain", use_container_width=True)
+    col_jsonl.download_button("JSONL", to_jsonl(snapshot), "metrics.jsonl", "application/jsonl", use_container_width=True)
 
-Group the insights by Category. Use markdown formatting (headers, bullet points) for readability.
 
-Here is the news data:
-{prompt_data_string}
-'''
-        response = model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        return f"⚠️ An error occurred while generating the AI Overview: {e}"
+@st.cache_resource
+def start_cache_warmer():
+    """Start the background warmer once per process (on the first script run)."""
+    if not CACHE_WARMER:
+        return None
+    interval = (FETCH_CACHE_TTL - timedelta(minutes=CACHE_WARM_LEAD_MIN)).total_seconds()
+    return CacheWarmer(warm_default_view, interval, next_day_start).start()
 
 # --- CALLBACKS ---
 def add_custom_topic():
@@ -234,78 +292,13 @@ def add_custom_topic():
 
     st.session_state.search_input = ""
 
-def md_to_html(text):
-    """Simple markdown to HTML converter for AI summary output."""
-    lines = text.split('\n')
-    html_lines = []
-    in_list = False
-
-    for line in lines:
-        stripped = line.strip()
-
-        # Close list if we're leaving a list context
-        if in_list and not stripped.startswith(('- ', '* ', '• ')):
-            html_lines.append('</ul>')
-            in_list = False
-
-        if not stripped:
-            html_lines.append('')
-            continue
-
-        # Headers
-        if stripped.startswith('#### '):
-            content = stripped[5:].strip()
-            content = re.sub(r'\*\*(.+?)\*\*', r'\1', content)
-            html_lines.append(f'<h4>{content}</h4>')
-        elif stripped.startswith('### '):
-            content = stripped[4:].strip()
-            content = re.sub(r'\*\*(.+?)\*\*', r'\1', content)
-            html_lines.append(f'<h3>{content}</h3>')
-        elif stripped.startswith('## '):
-            content = stripped[3:].strip()
-            content = re.sub(r'\*\*(.+?)\*\*', r'\1', content)
-            html_lines.append(f'<h2>{content}</h2>')
-        elif stripped.startswith('# '):
-            content = stripped[2:].strip()
-            content = re.sub(r'\*\*(.+?)\*\*', r'\1', content)
-            html_lines.append(f'<h1>{content}</h1>')
-        # Horizontal rule
-        elif stripped in ('---', '***', '___'):
-            html_lines.append('<hr>')
-        # List items
-        elif stripped.startswith(('- ', '* ', '• ')):
-            if not in_list:
-                html_lines.append('<ul>')
-                in_list = True
-            content = stripped[2:].strip()
-            # Handle bold
-            content = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', content)
-            content = re.sub(r'__(.+?)__', r'<strong>\1</strong>', content)
-            # Handle italic
-            content = re.sub(r'\*(.+?)\*', r'<em>\1</em>', content)
-            content = re.sub(r'_(.+?)_', r'<em>\1</em>', content)
-            html_lines.append(f'<li>{content}</li>')
-        # Regular paragraph
-        else:
-            content = stripped
-            # Standalone bold line = treat as heading
-            bold_match = re.match(r'^\*\*(.+?)\*\*$', content)
-            if bold_match:
-                html_lines.append(f'<h2>{bold_match.group(1)}</h2>')
-            else:
-                content = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', content)
-                content = re.sub(r'__(.+?)__', r'<strong>\1</strong>', content)
-                content = re.sub(r'\*(.+?)\*', r'<em>\1</em>', content)
-                content = re.sub(r'_(.+?)_', r'<em>\1</em>', content)
-                html_lines.append(f'<p>{content}</p>')
-
-    if in_list:
-        html_lines.append('</ul>')
-
-    return '\n'.join(html_lines)
+def show_more_cards():
+    st.session_state.feed_visible_count += FEED_PAGE_SIZE
 
 # --- APP CONFIGURATION ---
 st.set_page_config(page_title="The Wire", page_icon="📰", layout="centered")
+page_started = time.perf_counter()
+cache_warmer = start_cache_warmer()
 
 st.markdown('<div id="top-of-page"></div>', unsafe_allow_html=True)
 st.markdown('<div class="sidebar-hint" id="sidebar-hint-btn">⚙️ Filters</div>', unsafe_allow_html=True)
@@ -449,6 +442,9 @@ st.markdown('''
         border-style: solid; border-color: #1F2937 transparent transparent transparent;
     }
     .chip-overflow:hover .tooltip-text, .chip-overflow:active .tooltip-text { visibility: visible; opacity: 1; }
+    .also-reported { font-family: 'Inter', sans-serif; font-size: 12px; margin-top: 10px; color: #9CA3AF; }
+    .also-reported a { color: #60A5FA; text-decoration: none; }
+    .also-reported a:hover { text-decoration: underline; }
     .description-text { font-family: 'Inter', sans-serif; font-size: 15px; margin-top: 14px; color: #D1D5DB; line-height: 1.6; font-weight: 300; }
     .stButton button { width: 100%; border-radius: 5px; font-family: 'Inter', sans-serif; }
 
@@ -613,6 +609,7 @@ st.markdown('''
 
     </style>
 ''', unsafe_allow_html=True)
+st.markdown(CARD_CSS, unsafe_allow_html=True)
 
 # --- SIDEBAR ---
 with st.sidebar:
@@ -670,6 +667,8 @@ with st.sidebar:
             st.session_state.applied_sources = current_sources
             st.rerun()
 
+    debug_placeholder = st.empty()
+
 # --- MAIN UI MASTHEAD ---
 st.markdown('''
 <div class="masthead">
@@ -724,10 +723,8 @@ if is_edit_mode and st.session_state.saved_custom_topics:
         st.session_state.active_topics = [t for t in st.session_state.active_topics if t in DEFAULT_TOPICS or t in remaining]
     st.pills("Delete", options=st.session_state.saved_custom_topics, default=st.session_state.saved_custom_topics, key="temp_delete_widget", on_change=on_delete_change, selection_mode="multi", label_visibility="collapsed")
 
-FALLBACK_IMG = "data:image/svg+xml;base64,PHN2ZyB4bWxucz0naHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmcnIHdpZHRoPScxMjAnIGhlaWdodD0nMTIwJz48cmVjdCB3aWR0aD0nMTIwJyBoZWlnaHQ9JzEyMCcgZmlsbD0nIzFGMjkzNycvPjx0ZXh0IHg9JzUwJScgeT0nNTAlJyBmb250LXNpemU9JzQwJyB0ZXh0LWFuY2hvcj0nbWlkZGxlJyBkeT0nLjNlbSc+8J+TsDwvdGV4dD48L3N2Zz4="
-
 # --- MAIN APP BODY ---
-if not NEWS_API_KEYS:
+if not get_pipeline().scheduler.api_keys:
     st.warning("⚠️ Please enter at least one valid NewsAPI key.")
 elif not st.session_state.applied_topics:
     st.info("👈 Please select at least one topic above and click 'Update Feed' to view articles.")
@@ -735,43 +732,37 @@ else:
     if not st.session_state.applied_sources:
         st.warning("⚠️ Please select at least one source in the sidebar.")
     else:
+        pipeline = get_pipeline()
         try:
-            raw_articles = fetch_news_parallel(
-                st.session_state.applied_topics,
-                st.session_state.applied_sources,
-                st.session_state.applied_start_date,
-                st.session_state.applied_end_date
-            )
+            with pipeline.metrics.timer('fetch'):
+                raw_articles = fetch_news_parallel(
+                    st.session_state.applied_topics,
+                    st.session_state.applied_sources,
+                    st.session_state.applied_start_date,
+                    st.session_state.applied_end_date
+                )
         except Exception as e:
             st.error(f"🚨 API Error: {e}")
             raw_articles = []
 
-        processed_articles = []
-        seen_titles = set()
-
-        for article in raw_articles:
-            title = article.get('title') or ""
-
-            if title in seen_titles:
-                continue
-            seen_titles.add(title)
-
-            description = article.get('description') or ""
-            text_to_analyze = f"{title} {description}"
-
-            # Skip opinion/editorial pieces if filter is on
-            if st.session_state.get('hide_opinions', True) and is_opinion_article(title, description):
-                continue
-
-            article_tags = classify_article(text_to_analyze, st.session_state.applied_topics)
-
-            if not article_tags:
-                continue
-
-            article_tags.sort(key=lambda x: st.session_state.applied_topics.index(x) if x in st.session_state.applied_topics else 999)
-
-            article['computed_tags'] = article_tags
-            processed_articles.append(article)
+        # Reruns from UI-only interactions (filter pills, tabs, toggles) reuse
+        # the processed feed as long as its inputs are unchanged
+        processing_key = (
+            articles_fingerprint(raw_articles),
+            tuple(st.session_state.applied_topics),
+            st.session_state.get('hide_opinions', True),
+        )
+        cached_processing = st.session_state.get('_processed_cache')
+        if cached_processing and cached_processing[0] == processing_key:
+            _, processed_articles, collapsed_count, topic_index = cached_processing
+        else:
+            processed_articles, collapsed_count = pipeline.process(
+                raw_articles,
+                st.session_state.applied_topics,
+                st.session_state.get('hide_opinions', True),
+            )
+            topic_index = build_topic_index(processed_articles)
+            st.session_state._processed_cache = (processing_key, processed_articles, collapsed_count, topic_index)
 
         tab_feed, tab_ai = st.tabs(["📰 Feed", "✨ AI Overview"])
 
@@ -784,10 +775,7 @@ else:
                     st.info("No articles found matching these topics on the selected dates.")
             else:
                 # --- In-feed topic filter with article counts ---
-                topic_counts = {}
-                for a in processed_articles:
-                    for tag in a['computed_tags']:
-                        topic_counts[tag] = topic_counts.get(tag, 0) + 1
+                topic_counts = {topic: len(positions) for topic, positions in topic_index.items()}
 
                 filter_options = [
                     f"{t} ({topic_counts[t]})"
@@ -800,56 +788,38 @@ else:
                     if topic_counts.get(t, 0) > 0
                 }
 
-                selected_filter = st.pills(
+                selected_filters = st.pills(
                     "Filter by topic",
                     options=filter_options,
                     default=None,
-                    selection_mode="single",
+                    selection_mode="multi",
                     key="feed_topic_filter",
+                    help="Pick several topics to see only stories covering all of them",
                 )
 
-                if selected_filter:
-                    active_filter_topic = filter_label_to_topic.get(selected_filter)
-                    filtered_articles = [a for a in processed_articles if active_filter_topic in a['computed_tags']]
+                active_filter_topics = [filter_label_to_topic[f] for f in (selected_filters or []) if f in filter_label_to_topic]
+                if active_filter_topics:
+                    filtered_articles = [processed_articles[i] for i in select_by_topics(topic_index, active_filter_topics)]
                 else:
                     filtered_articles = processed_articles
 
-                st.caption(f"Showing **{len(filtered_articles)}** of {len(processed_articles)} articles")
-
-                for article in filtered_articles:
-                    title = article.get('title') or ""
-                    url = article.get('url') or "#"
-                    image_url = article.get('urlToImage')
-                    description = article.get('description') or ""
-
-                    tags_html = ""
-                    article_tags = article['computed_tags']
-                    visible_tags = article_tags[:2]
-                    hidden_tags = article_tags[2:]
-                    overflow_count = len(hidden_tags)
+                collapsed_note = f" · {collapsed_count} duplicate stories merged" if collapsed_count else ""
+                st.caption(f"Showing **{len(filtered_articles)}** of {len(processed_articles)} articles{collapsed_note}")
 
-                    for tag in visible_tags:
-                        tags_html += f'<span class="chip chip-category">{tag}</span>'
+                # Render the first page in a few batched elements; the rest loads on demand
+                feed_view_key = (processing_key, tuple(active_filter_topics))
+                if st.session_state.get('_feed_view_key') != feed_view_key:
+                    st.session_state._feed_view_key = feed_view_key
+                    st.session_state.feed_visible_count = FEED_PAGE_SIZE
 
-                    if overflow_count > 0:
-                        tooltip_text = ", ".join(hidden_tags)
-                        tags_html += f'<span class="chip chip-overflow">+{overflow_count}<span class="tooltip-text">{tooltip_text}</span></span>'
+                visible_articles = filtered_articles[:st.session_state.feed_visible_count]
+                with pipeline.metrics.timer('cards'):
+                    for cards_html in iter_card_batches(visible_articles, SOURCE_MAPPING):
+                        st.markdown(cards_html, unsafe_allow_html=True)
 
-                    iso_date = article.get('publishedAt', '')[:10]
-                    published_formatted = datetime.strptime(iso_date, '%Y-%m-%d').strftime('%b %d') if iso_date else "Unknown Date"
-
-                    api_source_name = article.get('source', {}).get('name', 'Unknown')
-                    api_source_id = article.get('source', {}).get('id', '')
-                    display_source = SOURCE_MAPPING.get(api_source_id, api_source_name)
-
-                    source_chip = f'<span class="chip chip-source">{display_source}</span>'
-
-                    if image_url:
-                        img_html = f'<div class="img-column"><img src="{image_url}" alt="Thumbnail" onerror="this.onerror=null; this.src=\'{FALLBACK_IMG}\';"></div>'
-                    else:
-                        img_html = f'<div class="img-column"><img src="{FALLBACK_IMG}" alt="Placeholder"></div>'
-
-                    st.markdown(f'''<div class="card-container"><div class="card-content"><div class="text-column"><a href="{url}" target="_blank" class="headline">{title}</a><div class="metadata">{source_chip}{tags_html}<span style="color: #6B7280; font-weight: bold;">•</span><span>{published_formatted}</span></div><p class="description-text">{description}</p></div>{img_html}</div></div>''', unsafe_allow_html=True)
+                remaining_count = len(filtered_articles) - len(visible_articles)
+                if remaining_count > 0:
+                    st.button(f"Load more ({remaining_count} remaining)", on_click=show_more_cards, use_container_width=True)
 
         # --- TAB 2: AI OVERVIEW ---
         with tab_ai:
@@ -872,22 +842,15 @@ else:
                     st.session_state._ai_generating = False
                     st.rerun()
 
-                prompt_lines = []
-                for a in processed_articles:
-                    cat_string = ", ".join(a['computed_tags'][:2])
-                    title = a.get('title') or "No Title"
-                    desc = a.get('description') or "No Description"
-                    content = a.get('content') or "No Content"
-                    prompt_lines.append(f"Categories: [{cat_string}] | Title: {title} | Desc: {desc} | Content: {content}")
-
-                prompt_data_string = "\n".join(prompt_lines)
+                summary_plan, prompt_report = pipeline.plan_summary(processed_articles, st.session_state.applied_topics)
 
                 current_feed_signature = f"{st.session_state.applied_topics}_{st.session_state.applied_start_date}_{st.session_state.applied_end_date}_{st.session_state.applied_sources}_{st.session_state.summary_mode}"
 
                 # Summary already cached for this feed + mode
                 if st.session_state.get('ai_summary_signature') == current_feed_signature:
                     encoded_summary = urllib.parse.quote(st.session_state.ai_summary_text)
-                    summary_html = md_to_html(st.session_state.ai_summary_text)
+                    with pipeline.metrics.timer('md_to_html'):
+                        summary_html = md_to_html(st.session_state.ai_summary_text)
                     st.markdown(f'''
                     <div class="ai-briefing-container">
                         {summary_html}
@@ -895,18 +858,34 @@ else:
                         <button id="copy-ai-btn" class="copy-btn" data-text="{encoded_summary}">📋 Copy to Clipboard</button>
                     </div>
                     ''', unsafe_allow_html=True)
+                    summary_caption = prompt_builder.describe_report(prompt_report)
+                    summary_timing = st.session_state.get('ai_summary_timing') or {}
+                    if summary_timing.get('cached'):
+                        summary_caption += " · served from summary cache"
+                    elif 'calls' in summary_timing:
+                        summary_caption += (
+                            f" · {summary_timing['calls']} model calls, {summary_timing['cached_sections']} topics cached"
+                            f" · first section {summary_timing['first_token_s']:.1f} s, total {summary_timing['total_s']:.1f} s"
+                        )
+                    elif 'total_s' in summary_timing:
+                        first_token = summary_timing.get('first_token_s')
+                        first_token_text = f"{first_token:.1f} s" if first_token is not None else "n/a"
+                        summary_caption += f" · first token {first_token_text}, total {summary_timing['total_s']:.1f} s"
+                    st.caption(summary_caption)
 
                 # Not yet generated — auto-generate
                 else:
-                    # Auto-trigger generation
-                    if not st.session_state.get('_ai_generating', False):
+                    # The blocking path reruns once first so the loading state is
+                    # on screen while it waits; streaming replaces it in place
+                    if not SUMMARY_STREAMING and not st.session_state.get('_ai_generating', False):
                         st.session_state._ai_generating = True
                         st.rerun()
 
                     mode_label = "quick briefing" if st.session_state.summary_mode == "brief" else "detailed analysis"
 
                     # Show loading state while generating
-                    st.markdown('''
+                    summary_placeholder = st.empty()
+                    summary_placeholder.markdown('''
                     <div class="ai-briefing-container" style="text-align: center; padding: 3rem 2rem;">
                         <div style="font-size: 36px; margin-bottom: 16px; animation: pulse-hint 1.5s ease-in-out infinite;">✨</div>
                         <p style="font-family: Inter, sans-serif; font-size: 16px; font-weight: 500; color: #E5E7EB; margin-bottom: 8px;">
@@ -922,15 +901,37 @@ else:
                             <div class="skeleton-line" style="height: 12px; border-radius: 4px; margin: 0 auto; width: 60%;"></div>
                         </div>
                     </div>
-                    '''.format(count=len(processed_articles), mode=mode_label), unsafe_allow_html=True)
+                    '''.format(count=prompt_report['included'], mode=mode_label), unsafe_allow_html=True)
+
+                    date_context = summary_date_context(st.session_state.applied_start_date, st.session_state.applied_end_date)
+                    summary_timing = {}
+                    summary_chunks = pipeline.generate_summary(
+                        summary_plan, date_context, st.session_state.summary_mode, summary_timing, SUMMARY_STREAMING)
+
+                    if SUMMARY_STREAMING:
+                        summary_markdown = ""
+                        for chunk in summary_chunks:
+                            summary_markdown += chunk
+                            summary_placeholder.markdown(
+                                f'<div class="ai-briefing-container">{render_markdown(summary_markdown)}</div>',
+                                unsafe_allow_html=True,
+                            )
+                    else:
+                        summary_markdown = "".join(summary_chunks)
+                        # Nothing was shown before the whole summary was ready
+                        summary_timing['first_token_s'] = summary_timing.get('total_s')
 
-                    date_context = f"{st.session_state.applied_start_date.strftime('%B %d')} and {st.session_state.applied_end_date.strftime('%B %d')}"
-                    summary_markdown = get_gemini_summary(prompt_data_string, date_context, st.session_state.summary_mode)
                     st.session_state.ai_summary_text = summary_markdown
+                    st.session_state.ai_summary_timing = summary_timing
                     st.session_state.ai_summary_signature = current_feed_signature
                     st.session_state._ai_generating = False
                     st.rerun()
 
+if DEBUG_PANEL or st.query_params.get("debug") == "1":
+    with debug_placeholder.container():
+        with st.expander("🛠️ Debug"):
+            render_debug_panel(get_pipeline(), cache_warmer)
+
 # Back to top button
 st.markdown(
     '''
@@ -1032,4 +1033,5 @@ components.html(
     """,
     height=0,
     width=0
-)
\ No newline at end of file
+)
+get_pipeline().metrics.record('page', time.perf_counter() - page_started)
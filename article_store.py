@@ -0,0 +1,150 @@
+"""On-disk store of fetched NewsAPI articles.
+
+Articles are keyed by source id, topic query and publish day (UTC, taken from
+``publishedAt``). A separate coverage table records which (source, query, day)
+slots have been fetched completely, so settled days can be served from disk
+and only recent or never-fetched days need to go to NewsAPI. NewsAPI indexes
+articles with a lag, so a day is not settled until ``SETTLE_DAYS`` after it:
+until then it is refetched like today, or late-indexed articles would never
+be picked up.
+"""
+import json
+import sqlite3
+import threading
+from datetime import date, timedelta
+
+# Days before today that are still refetched (1 = yesterday and today)
+SETTLE_DAYS = 1
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS articles (
+    source  TEXT NOT NULL,
+    query   TEXT NOT NULL,
+    day     TEXT NOT NULL,
+    url     TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (source, query, day, url)
+);
+CREATE TABLE IF NOT EXISTS coverage (
+    source     TEXT NOT NULL,
+    query      TEXT NOT NULL,
+    day        TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    PRIMARY KEY (source, query, day)
+);
+'''
+
+
+def iter_days(start, end):
+    for offset in range((end - start).days + 1):
+        yield start + timedelta(days=offset)
+
+
+def article_day(article):
+    return (article.get('publishedAt') or '')[:10]
+
+
+class ArticleStore:
+    def __init__(self, path):
+        self.path = path
+        self._write_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        # A short-lived connection per call keeps this safe to use from the
+        # fetch thread pool; WAL lets readers proceed while a write is open.
+        return sqlite3.connect(self.path, timeout=30)
+
+    def covered_sources(self, query, sources, start, end):
+        """Return {day: set(source ids)} of fully fetched slots in [start, end]."""
+        placeholders = ','.join('?' * len(sources))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f'SELECT day, source FROM coverage WHERE query = ? AND day BETWEEN ? AND ? '
+                f'AND source IN ({placeholders})',
+                (query, start.isoformat(), end.isoformat(), *sources),
+            ).fetchall()
+
+        covered = {}
+        for day, source in rows:
+            covered.setdefault(date.fromisoformat(day), set()).add(source)
+        return covered
+
+    def load(self, query, sources, start, end):
+        """Load stored articles for the covered slots of [start, end]."""
+        placeholders = ','.join('?' * len(sources))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f'SELECT a.payload FROM articles a JOIN coverage c '
+                f'ON a.source = c.source AND a.query = c.query AND a.day = c.day '
+                f'WHERE a.query = ? AND a.day BETWEEN ? AND ? AND a.source IN ({placeholders})',
+                (query, start.isoformat(), end.isoformat(), *sources),
+            ).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def save(self, query, sources, articles, complete_days):
+        """Store articles and mark ``complete_days`` as covered for ``sources``."""
+        article_rows = [
+            ((a.get('source') or {}).get('id') or '', query, article_day(a), a.get('url') or '', json.dumps(a))
+            for a in articles
+            if article_day(a)
+        ]
+        fetched_at = date.today().isoformat()
+        coverage_rows = [
+            (source, query, day.isoformat(), fetched_at)
+            for day in complete_days
+            for source in sources
+        ]
+
+        with self._write_lock, self._connect() as conn:
+            conn.executemany('INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?)', article_rows)
+            conn.executemany('INSERT OR REPLACE INTO coverage VALUES (?, ?, ?, ?)', coverage_rows)
+
+    def prune(self, before_day):
+        """Drop everything published before ``before_day``."""
+        with self._write_lock, self._connect() as conn:
+            conn.execute('DELETE FROM articles WHERE day < ?', (before_day.isoformat(),))
+            conn.execute('DELETE FROM coverage WHERE day < ?', (before_day.isoformat(),))
+
+
+def settled_before(today, settle_days=SETTLE_DAYS):
+    """First day that is still filling up: it and later days are always refetched."""
+    return today - timedelta(days=settle_days)
+
+
+def plan_fetches(sources, start, end, covered, unsettled_from):
+    """Group the slots that still need NewsAPI into contiguous day runs.
+
+    Returns a list of (run_start, run_end, missing_sources). Days from
+    ``unsettled_from`` on are always refetched since they are still filling up.
+    """
+    runs = []
+    for day in iter_days(start, end):
+        if day >= unsettled_from:
+            missing = tuple(sources)
+        else:
+            missing = tuple(s for s in sources if s not in covered.get(day, set()))
+        if not missing:
+            continue
+        if runs and runs[-1][2] == missing and runs[-1][1] == day - timedelta(days=1):
+            runs[-1] = (runs[-1][0], day, missing)
+        else:
+            runs.append((day, day, missing))
+    return runs
+
+
+def complete_days(articles, start, end, unsettled_from, truncated):
+    """Days of a fetched run that can be marked as fully stored.
+
+    Results come back newest first, so when a response was truncated every day
+    newer than the oldest returned article is still complete.
+    """
+    days = [d for d in iter_days(start, end) if d < unsettled_from]
+    if truncated:
+        oldest = min((article_day(a) for a in articles if article_day(a)), default=None)
+        if oldest is None:
+            return []
+        days = [d for d in days if d.isoformat() > oldest]
+    return days
@@ -0,0 +1,106 @@
+"""Compact article records used from fetch through rendering.
+
+Raw NewsAPI dicts carry fields the app never reads (``author``, the nested
+``source`` dict) and get copied on every ``st.cache_data`` hit. ``Article``
+keeps only what the feed and summary use, in slots, with interned source
+ids/names and topic tags stored as a bitmask.
+"""
+import re
+import sys
+
+# NewsAPI truncates `content` to ~200 chars and appends "… [+1234 chars]"
+_TRUNCATION_MARKER = re.compile(r'…?\s*\[\+\d+ chars\]$')
+
+
+def _intern(value):
+    return sys.intern(value) if value else value
+
+
+class Article:
+    __slots__ = (
+        'title', 'description', 'url', 'image_url', 'published_at',
+        'source_id', 'source_name', 'content',
+        'tag_mask', 'topic_names', 'alternate_sources',
+    )
+
+    def __init__(self, title, description, url, image_url, published_at, source_id, source_name,
+                 content, tag_mask=0, topic_names=(), alternate_sources=()):
+        self.title = title
+        self.description = description
+        self.url = url
+        self.image_url = image_url
+        self.published_at = published_at
+        self.source_id = _intern(source_id)
+        self.source_name = _intern(source_name)
+        self.content = content
+        # Bit i set means tagged with topic_names[i]; topic_names is shared
+        # by every article processed for the same topic set.
+        self.tag_mask = tag_mask
+        self.topic_names = topic_names
+        # (source_id, source_name, url) of near-duplicates from other outlets
+        self.alternate_sources = alternate_sources
+
+    @classmethod
+    def from_api(cls, raw):
+        source = raw.get('source') or {}
+        return cls(
+            title=raw.get('title') or "",
+            description=raw.get('description') or "",
+            url=raw.get('url') or "",
+            image_url=raw.get('urlToImage'),
+            published_at=raw.get('publishedAt') or "",
+            source_id=source.get('id') or "",
+            source_name=source.get('name') or "Unknown",
+            content=_TRUNCATION_MARKER.sub('', raw.get('content') or ""),
+        )
+
+    def __reduce__(self):
+        # A plain positional tuple pickles smaller and faster than slot state
+        return (Article, (
+            self.title, self.description, self.url, self.image_url, self.published_at,
+            self.source_id, self.source_name, self.content,
+            self.tag_mask, self.topic_names, self.alternate_sources,
+        ))
+
+    def __repr__(self):
+        return f"Article({self.source_id or self.source_name}: {self.title!r})"
+
+    def as_dict(self):
+        """JSON-ready view with tags and alternates spelled out."""
+        return {
+            'title': self.title,
+            'description': self.description,
+            'url': self.url,
+            'image_url': self.image_url,
+            'published_at': self.published_at,
+            'source_id': self.source_id,
+            'source_name': self.source_name,
+            'content': self.content,
+            'tags': self.computed_tags,
+            'alternate_sources': [
+                {'source_id': source_id, 'source_name': source_name, 'url': url}
+                for source_id, source_name, url in self.alternate_sources
+            ],
+        }
+
+    @property
+    def computed_tags(self):
+        """Tags in topic order."""
+        mask = self.tag_mask
+        return [topic for i, topic in enumerate(self.topic_names) if mask >> i & 1]
+
+    def set_tags(self, tags, topic_names):
+        positions = {topic: i for i, topic in enumerate(topic_names)}
+        self.topic_names = topic_names
+        self.tag_mask = 0
+        for tag in tags:
+            self.tag_mask |= 1 << positions[tag]
+
+
+def from_api_articles(raw_articles):
+    """Convert NewsAPI dicts, dropping untitled and "[Removed]" entries."""
+    return [
+        Article.from_api(a)
+        for a in raw_articles
+        if a.get('title') and a['title'] != "[Removed]"
+    ]
@@ -0,0 +1,51 @@
+"""Cache footprint of raw NewsAPI dicts vs compact Article records.
+
+    python benchmarks/bench_article_repr.py --articles 600
+
+st.cache_data keeps each entry pickled and unpickles a fresh copy on every
+hit, so the pickled size is the cache memory per entry and the unpickle time
+is the per-hit copy cost. Live memory of one unpickled copy is also shown.
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from articles import from_api_articles  # noqa: E402
+from corpus import synthetic_corpus  # noqa: E402
+
+
+def measure(label, value, repeat=20):
+    blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        pickle.loads(blob)
+    per_hit = (time.perf_counter() - started) / repeat
+
+    tracemalloc.start()
+    copy = pickle.loads(blob)
+    live, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del copy
+    print(f"{label:<16} pickled {len(blob) / 1024:8.1f} KiB   per-hit copy {per_hit * 1000:6.2f} ms   live {live / 1024:8.1f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=600)
+    args = parser.parse_args()
+
+    # No reworded copies: text fields are unique per article, as in real
+    # responses, so pickle can't share them between entries
+    raw = synthetic_corpus(args.articles, duplicate_rate=0)
+    print(f"{args.articles} articles")
+    measure("raw dicts", raw)
+    measure("Article records", from_api_articles(raw))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark the compiled topic matcher against the original per-keyword loop.
+
+    python benchmarks/bench_classify.py --articles 500 --custom-topics 40
+
+Checks that both return identical tags for every article before timing them.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from corpus import synthetic_corpus  # noqa: E402
+from text_matching import get_topic_matcher  # noqa: E402
+from topics import DEFAULT_TOPICS, TOPIC_KEYWORDS  # noqa: E402
+
+CUSTOM_TOPICS = [
+    "Nvidia", "Tesla", "Apple", "Google", "Microsoft", "Amazon", "Meta", "Tsmc", "Intel", "Netflix",
+    "Disney", "Spacex", "Bitcoin", "Crypto", "Ethereum", "Federal Reserve", "Inflation", "Interest Rates",
+    "Recession", "Ipo", "Venture Capital", "Real Estate", "Housing Market", "China", "Russia", "Ukraine",
+    "Nato", "Middle East", "Iran", "Trade", "Tariffs", "Supply Chain", "Climate", "Energy", "Solar",
+    "Healthcare", "Pharma", "Biotech", "Fda", "Space", "Nasa", "Openai", "Robotics", "Layoffs", "Jobs",
+]
+
+
+def classify_reference(text, applied_topics):
+    """The original implementation, kept here as the baseline."""
+    found_tags = []
+    text_lower = text.lower()
+    for topic in applied_topics:
+        keywords = TOPIC_KEYWORDS.get(topic, [topic.lower()])
+        for kw in keywords:
+            if re.search(rf'\b{re.escape(kw)}\b', text_lower):
+                found_tags.append(topic)
+                break
+    return list(dict.fromkeys(found_tags))
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=500)
+    parser.add_argument('--custom-topics', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    topics = DEFAULT_TOPICS + CUSTOM_TOPICS[:args.custom_topics]
+    raw_articles = synthetic_corpus(args.articles, {topic: 1 for topic in topics})
+    texts = [f"{a['title']} {a['description']}" for a in raw_articles]
+
+    matcher = get_topic_matcher(topics, TOPIC_KEYWORDS)
+    mismatches = sum(classify_reference(t, topics) != matcher.match(t) for t in texts)
+    if mismatches:
+        sys.exit(f"{mismatches} articles tagged differently")
+
+    baseline = best_of(lambda: [classify_reference(t, topics) for t in texts], args.repeat)
+    compiled = best_of(lambda: [get_topic_matcher(topics, TOPIC_KEYWORDS).match(t) for t in texts], args.repeat)
+    print(f"{len(texts)} articles x {len(topics)} topics, tags identical")
+    print(f"per-keyword re.search  {baseline * 1000:8.2f} ms")
+    print(f"compiled matcher       {compiled * 1000:8.2f} ms   ({baseline / compiled:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
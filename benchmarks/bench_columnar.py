@@ -0,0 +1,111 @@
+"""Compare the pandas columnar pipeline with the per-article loop.
+
+    python benchmarks/bench_columnar.py --sizes 1000 10000 100000
+
+Near-duplicate clustering is shared code, and on this corpus it would swamp
+the difference at large sizes. Dedup is roughly linear on real headlines,
+but the synthetic text draws on a few dozen filler words, so unrelated
+articles share shingles, LSH buckets grow with the corpus and candidate
+pairs grow about quadratically (4k articles take 0.5s, 16k take 5.7s).
+What is timed is the part the engines do differently: opinion and topic
+matching over every article (per-article regex calls against
+``string[pyarrow]`` column passes). Both must give every article the same
+tag mask and opinion verdict, and at the smallest size the two full
+pipelines must agree on the kept articles, their order, tags and
+alternate sources.
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from articles import from_api_articles  # noqa: E402
+from columnar import TEXT_DTYPE, _contains, non_ascii_rows, process_articles_columnar, tag_masks  # noqa: E402
+from corpus import synthetic_corpus  # noqa: E402
+from pipeline import process_articles  # noqa: E402
+from text_matching import OPINION_SIGNALS, OpinionDetector, get_topic_matcher  # noqa: E402
+from topics import DEFAULT_TOPICS, TOPIC_KEYWORDS  # noqa: E402
+
+
+def synthetic_articles(n, seed=0):
+    """Newest-first ``Article`` records with publish times cut to the hour,
+    so timestamps collide often and tie order matters."""
+    raw_articles = synthetic_corpus(n, seed=seed)
+    for raw in raw_articles:
+        raw['publishedAt'] = raw['publishedAt'][:13] + ":00:00Z"
+    return from_api_articles(raw_articles)
+
+
+def snapshot(processed):
+    return [(a.url, a.tag_mask, a.topic_names, a.alternate_sources) for a in processed]
+
+
+def match_loop(articles, topic_names):
+    """(tag masks, opinion verdicts) the way ``process_articles`` computes them."""
+    topic_matcher = get_topic_matcher(topic_names, TOPIC_KEYWORDS)
+    opinion_detector = OpinionDetector(OPINION_SIGNALS)
+    positions = {topic: i for i, topic in enumerate(topic_names)}
+    masks, opinions = [], []
+    for article in articles:
+        mask = 0
+        for tag in topic_matcher.match(f"{article.title} {article.description}"):
+            mask |= 1 << positions[tag]
+        masks.append(mask)
+        opinions.append(opinion_detector.is_opinion(article.title, article.description, article.url))
+    return masks, opinions
+
+
+def match_columnar(articles, topic_names):
+    """(tag masks, opinion verdicts) the way ``process_articles_columnar`` computes them."""
+    frame = pd.DataFrame({
+        'title': [a.title for a in articles],
+        'description': [a.description for a in articles],
+    }, dtype=TEXT_DTYPE)
+    text = (frame['title'] + ' ' + frame['description']).str.lower()
+    recheck_rows = non_ascii_rows(f"{a.title} {a.description}" for a in articles)
+    masks = tag_masks(text, topic_names, recheck_rows=recheck_rows)
+    opinions = _contains(text, OpinionDetector(OPINION_SIGNALS).pattern, recheck_rows)
+    return masks.tolist(), opinions.tolist()
+
+
+def best_of(fn, repeat, *args):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    topic_names = tuple(DEFAULT_TOPICS)
+    raw = synthetic_articles(min(args.sizes))
+    loop_out, loop_collapsed = process_articles(
+        copy.deepcopy(raw), DEFAULT_TOPICS, True, OpinionDetector(OPINION_SIGNALS))
+    col_out, col_collapsed = process_articles_columnar(
+        copy.deepcopy(raw), DEFAULT_TOPICS, True, OpinionDetector(OPINION_SIGNALS))
+    if snapshot(loop_out) != snapshot(col_out) or loop_collapsed != col_collapsed:
+        sys.exit(f"{len(raw)} articles: columnar output differs from the loop")
+
+    print(f"{'articles':>9} {'loop':>10} {'columnar':>10} {'speedup':>8}")
+    for n in args.sizes:
+        articles = synthetic_articles(n)
+        loop_time, loop_result = best_of(match_loop, args.repeat, articles, topic_names)
+        col_time, col_result = best_of(match_columnar, args.repeat, articles, topic_names)
+        if loop_result != col_result:
+            sys.exit(f"{n} articles: columnar tags or opinion verdicts differ from the loop")
+        print(f"{n:>9} {loop_time * 1000:>8.1f}ms {col_time * 1000:>8.1f}ms {loop_time / col_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
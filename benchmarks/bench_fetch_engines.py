@@ -0,0 +1,94 @@
+"""Compare the threaded and asyncio NewsAPI fetch engines against a local mock.
+
+    python benchmarks/bench_fetch_engines.py --topics 24 --latency 0.15
+
+Starts mock_server.py in its own process (so its threads don't count
+against the engines), answering /v2/everything with paged, newest-first
+articles after a fixed delay, then fetches the same topic set
+with both engines and reports wall time, upstream requests and peak threads.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import newsapi  # noqa: E402
+import newsapi_async  # noqa: E402
+from mock_server import start_mock_server  # noqa: E402
+
+
+class ThreadSampler:
+    """Records the peak number of live threads while a block runs."""
+
+    def __enter__(self):
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(0.005):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def topic_params(n_topics):
+    return [
+        {'q': f'"topic{i}"', 'from': '2025-01-01', 'to': '2025-01-10', 'sortBy': 'publishedAt'}
+        for i in range(n_topics)
+    ]
+
+
+def run_threaded(param_sets, scheduler, url):
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        return list(executor.map(lambda p: newsapi.get_everything_paged(p, scheduler, url=url), param_sets))
+
+
+def run_async(param_sets, scheduler, url, concurrency):
+    engine = newsapi_async.AsyncFetchEngine(scheduler, concurrency=concurrency, url=url)
+    return engine.fetch_all(param_sets)
+
+
+def measure(label, fn):
+    requests_before = newsapi.STATS.snapshot()['requests']
+    with ThreadSampler() as sampler:
+        started = time.perf_counter()
+        results = fn()
+        elapsed = time.perf_counter() - started
+    articles = sum(len(r['articles']) for r in results if r)
+    upstream = newsapi.STATS.snapshot()['requests'] - requests_before
+    print(f"{label:<10} {elapsed * 1000:9.1f} ms  {upstream:5d} requests  {articles:7d} articles  peak threads {sampler.peak}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--topics', type=int, default=24)
+    parser.add_argument('--total-results', type=int, default=300, help="totalResults per topic")
+    parser.add_argument('--latency', type=float, default=0.15, help="mock response delay in seconds")
+    parser.add_argument('--concurrency', type=int, default=newsapi_async.DEFAULT_CONCURRENCY)
+    args = parser.parse_args()
+
+    server, port = start_mock_server(args.latency, args.total_results)
+    url = f"http://127.0.0.1:{port}/v2/everything"
+
+    param_sets = topic_params(args.topics)
+    print(f"{args.topics} topics x {args.total_results} results, {args.latency * 1000:.0f} ms upstream latency")
+    try:
+        measure("threads", lambda: run_threaded(
+            param_sets, newsapi.KeyScheduler(['k1', 'k2', 'k3'], daily_quota=10**6), url))
+        measure("asyncio", lambda: run_async(
+            param_sets, newsapi.KeyScheduler(['k1', 'k2', 'k3'], daily_quota=10**6), url, args.concurrency))
+    finally:
+        server.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark the combined opinion pattern against the original per-signal loop.
+
+    python benchmarks/bench_opinion.py --articles 2000 --opinion-rate 0.1
+
+Checks that both give the same verdict for every article before timing
+them. The detector runs with a fresh memo each time, so every article is a
+miss, as on a first fetch.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from articles import from_api_articles  # noqa: E402
+from corpus import synthetic_corpus  # noqa: E402
+from text_matching import OPINION_SIGNALS, OpinionDetector  # noqa: E402
+
+
+def is_opinion_reference(title, description):
+    """The original implementation, kept here as the baseline."""
+    text = f"{title} {description}".lower()
+    for pattern in OPINION_SIGNALS:
+        if re.search(pattern, text):
+            return True
+    return False
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=2000)
+    parser.add_argument('--opinion-rate', type=float, default=0.1)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    articles = from_api_articles(synthetic_corpus(args.articles, opinion_rate=args.opinion_rate, seed=args.seed))
+
+    def reference():
+        return [is_opinion_reference(a.title, a.description) for a in articles]
+
+    def detector():
+        opinion_detector = OpinionDetector(OPINION_SIGNALS)
+        return [opinion_detector.is_opinion(a.title, a.description, a.url) for a in articles]
+
+    expected = reference()
+    mismatches = sum(x != y for x, y in zip(expected, detector()))
+    if mismatches:
+        sys.exit(f"{mismatches} articles got a different verdict")
+
+    ref_s = best_of(reference, args.repeat)
+    new_s = best_of(detector, args.repeat)
+    print(f"{len(articles)} articles, {sum(expected)} opinion, {len(OPINION_SIGNALS)} signals")
+    print(f"per-signal loop:  {ref_s * 1000:8.1f} ms")
+    print(f"combined pattern: {new_s * 1000:8.1f} ms  ({ref_s / new_s:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Feed card rendering: one element per card vs batched, paged rendering.
+
+    python benchmarks/bench_render.py --articles 300
+
+Measures, for the initial feed render, the time until the first card's HTML
+is ready to send, total build time, HTML payload bytes and the number of
+Streamlit elements (each one is its own delta message over the websocket).
+Browser layout time is not measured here.
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from articles import Article  # noqa: E402
+from corpus import synthetic_corpus  # noqa: E402
+from rendering import CARD_CSS, FALLBACK_IMG, iter_card_batches  # noqa: E402
+from sources import SOURCE_MAPPING  # noqa: E402
+
+TOPIC_NAMES = ('Tech', 'AI', 'Stocks', 'Politics', 'Nuclear')
+FEED_PAGE_SIZE = 30
+
+
+def render_card_reference(article):
+    """The original per-card f-string/+= builder with the inlined fallback image."""
+    title = article.get('title') or ""
+    url = article.get('url') or "#"
+    image_url = article.get('urlToImage')
+    description = article.get('description') or ""
+
+    tags_html = ""
+    article_tags = article['computed_tags']
+    visible_tags = article_tags[:2]
+    hidden_tags = article_tags[2:]
+    overflow_count = len(hidden_tags)
+    for tag in visible_tags:
+        tags_html += f'<span class="chip chip-category">{tag}</span>'
+    if overflow_count > 0:
+        tooltip_text = ", ".join(hidden_tags)
+        tags_html += f'<span class="chip chip-overflow">+{overflow_count}<span class="tooltip-text">{tooltip_text}</span></span>'
+
+    iso_date = article.get('publishedAt', '')[:10]
+    published_formatted = datetime.strptime(iso_date, '%Y-%m-%d').strftime('%b %d') if iso_date else "Unknown Date"
+    display_source = SOURCE_MAPPING.get(article['source'].get('id', ''), article['source'].get('name', 'Unknown'))
+    source_chip = f'<span class="chip chip-source">{display_source}</span>'
+    if image_url:
+        img_html = f'<div class="img-column"><img src="{image_url}" alt="Thumbnail" onerror="this.onerror=null; this.src=\'{FALLBACK_IMG}\';"></div>'
+    else:
+        img_html = f'<div class="img-column"><img src="{FALLBACK_IMG}" alt="Placeholder"></div>'
+    return f'''<div class="card-container"><div class="card-content"><div class="text-column"><a href="{url}" target="_blank" class="headline">{title}</a><div class="metadata">{source_chip}{tags_html}<span style="color: #6B7280; font-weight: bold;">•</span><span>{published_formatted}</span></div><p class="description-text">{description}</p></div>{img_html}</div></div>'''
+
+
+def synthetic_articles(n, seed=0):
+    """Raw NewsAPI-style dicts with ``computed_tags``, as the old renderer expected."""
+    rng = random.Random(seed)
+    raw_articles = synthetic_corpus(n, seed=seed)
+    for raw in raw_articles:
+        raw['computed_tags'] = rng.sample(TOPIC_NAMES, rng.randint(1, 4))
+    return raw_articles
+
+
+def to_records(raw_articles):
+    records = []
+    for raw in raw_articles:
+        record = Article.from_api(raw)
+        record.set_tags(raw['computed_tags'], TOPIC_NAMES)
+        records.append(record)
+    return records
+
+
+def measure(label, chunks_fn):
+    started = time.perf_counter()
+    first_at = None
+    elements = 0
+    payload = 0
+    for chunk in chunks_fn():
+        if first_at is None and 'card-container' in chunk:
+            first_at = time.perf_counter() - started
+        elements += 1
+        payload += len(chunk.encode())
+    total = time.perf_counter() - started
+    print(f"{label:<22} first card {first_at * 1000:6.2f} ms   total {total * 1000:7.2f} ms   "
+          f"{elements:4d} elements   {payload / 1024:8.1f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=300)
+    args = parser.parse_args()
+
+    raw_articles = synthetic_articles(args.articles)
+    articles = to_records(raw_articles)
+    print(f"Initial feed render for {args.articles} articles")
+    measure("per-card (before)", lambda: (render_card_reference(a) for a in raw_articles))
+    measure("batched, all cards", lambda: itertools.chain([CARD_CSS], iter_card_batches(articles, SOURCE_MAPPING)))
+    measure("batched, first page", lambda: itertools.chain([CARD_CSS], iter_card_batches(articles[:FEED_PAGE_SIZE], SOURCE_MAPPING)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Rerun latency of the article pipeline with and without the session memo.
+
+    python benchmarks/bench_rerun.py --articles 400 --reruns 20
+
+A UI-only rerun (filter pill, tab switch, summary toggle) gets the same fetch
+result back. Without the memo every rerun redoes dedup → opinion filter →
+classify → tag sort; with it a rerun only fingerprints the fetch result and
+compares keys, as app.py does.
+"""
+import argparse
+import copy
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from articles import from_api_articles  # noqa: E402
+from corpus import synthetic_corpus  # noqa: E402
+from pipeline import articles_fingerprint, process_articles  # noqa: E402
+from text_matching import OPINION_SIGNALS, OpinionDetector  # noqa: E402
+from topics import DEFAULT_TOPICS  # noqa: E402
+
+
+def run(raw_fetches, use_memo):
+    detector = OpinionDetector(OPINION_SIGNALS)
+    memo = None
+    timings = []
+    for raw_articles in raw_fetches:
+        started = time.perf_counter()
+        key = (articles_fingerprint(raw_articles), tuple(DEFAULT_TOPICS), True)
+        if use_memo and memo and memo[0] == key:
+            processed = memo[1]
+        else:
+            processed, _ = process_articles(raw_articles, DEFAULT_TOPICS, True, detector)
+            memo = (key, processed)
+        timings.append(time.perf_counter() - started)
+    return timings, len(processed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=400)
+    parser.add_argument('--reruns', type=int, default=20)
+    args = parser.parse_args()
+
+    raw = from_api_articles(synthetic_corpus(args.articles))
+    # st.cache_data hands back a fresh copy on every rerun
+    fetches = [copy.deepcopy(raw) for _ in range(args.reruns)]
+
+    print(f"{args.articles} fetched articles, {args.reruns} reruns")
+    for label, use_memo in (("no memo", False), ("memo", True)):
+        timings, kept = run(fetches, use_memo)
+        print(f"{label:<8} first {timings[0] * 1000:7.2f} ms   "
+              f"later reruns median {statistics.median(timings[1:]) * 1000:7.3f} ms   ({kept} articles kept)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""Per-stage throughput and latency of the article pipeline, offline.
+
+    python benchmarks/bench_suite.py --articles 2000 --save-baseline baseline.json
+    python benchmarks/bench_suite.py --articles 2000 --baseline baseline.json --max-regression 0.15
+    python benchmarks/bench_suite.py --fixtures 'benchmarks/fixtures/*.json'
+
+Runs each stage ``--repeat`` times over the same input: conversion to
+``Article``, near-duplicate collapsing, the opinion filter (fresh memo each
+run), topic classification, the whole ``process_articles`` pass, prompt
+building, markdown rendering of a detailed-mode summary (uncached, as
+while streaming) and feed card rendering. Input is either recorded
+NewsAPI responses (see corpus.py) or a synthetic corpus of ``--articles``
+stories over the ``--mix`` topics.
+
+Reports items/s and p50/p99 milliseconds per run. ``--save-baseline``
+stores the results as JSON; ``--baseline`` prints each stage's p50 against
+the stored one and exits non-zero if any got slower by more than
+``--max-regression``.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import prompt_builder  # noqa: E402
+from articles import from_api_articles  # noqa: E402
+from corpus import load_fixtures, parse_mix, synthetic_corpus, synthetic_summary  # noqa: E402
+from dedup import collapse_near_duplicates  # noqa: E402
+from newsapi import percentile  # noqa: E402
+from pipeline import process_articles  # noqa: E402
+from rendering import iter_card_batches, render_markdown  # noqa: E402
+from sources import SOURCE_MAPPING  # noqa: E402
+from text_matching import OPINION_SIGNALS, OpinionDetector, get_topic_matcher  # noqa: E402
+from topics import DEFAULT_TOPICS, TOPIC_KEYWORDS  # noqa: E402
+
+
+def build_stages(raw_articles, topics, summary_markdown):
+    """{name: (setup, run, items)}. Only ``run(setup())`` is timed; ``items``
+    is what one run processes, for throughput."""
+    topic_names = tuple(dict.fromkeys(topics))
+    articles = from_api_articles(raw_articles)
+    texts = [f"{a.title} {a.description}" for a in articles]
+    processed, _ = process_articles(from_api_articles(raw_articles), topics, True, OpinionDetector(OPINION_SIGNALS))
+
+    def opinion(detector):
+        return [detector.is_opinion(a.title, a.description, a.url) for a in articles]
+
+    def classify(_):
+        topic_matcher = get_topic_matcher(topic_names, TOPIC_KEYWORDS)
+        return [topic_matcher.match(text) for text in texts]
+
+    def process(state):
+        return process_articles(state[0], topics, True, state[1])
+
+    def no_setup():
+        return None
+
+    return {
+        'from_api': (no_setup, lambda _: from_api_articles(raw_articles), len(raw_articles)),
+        'dedup': (lambda: from_api_articles(raw_articles), collapse_near_duplicates, len(raw_articles)),
+        'opinion': (lambda: OpinionDetector(OPINION_SIGNALS), opinion, len(articles)),
+        'classify': (no_setup, classify, len(texts)),
+        'process': (lambda: (from_api_articles(raw_articles), OpinionDetector(OPINION_SIGNALS)), process, len(raw_articles)),
+        'prompt': (no_setup, lambda _: prompt_builder.build_prompt_data(processed), len(processed)),
+        'md_to_html': (no_setup, lambda _: render_markdown(summary_markdown), summary_markdown.count('\n') + 1),
+        'cards': (no_setup, lambda _: list(iter_card_batches(processed, SOURCE_MAPPING)), len(processed)),
+    }
+
+
+def measure(setup, run, items, repeat, warmup=1):
+    for _ in range(warmup):
+        run(setup())
+    timings = []
+    for _ in range(repeat):
+        state = setup()
+        started = time.perf_counter()
+        run(state)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    p50 = percentile(timings, 50)
+    return {
+        'items': items,
+        'p50_ms': p50 * 1000,
+        'p99_ms': percentile(timings, 99) * 1000,
+        'items_per_s': items / p50 if p50 else 0.0,
+    }
+
+
+def compare(results, baseline, max_regression):
+    """Print p50 against the baseline; return the stages that regressed."""
+    regressed = []
+    print(f"\n{'stage':<12} {'baseline':>10} {'now':>10} {'change':>8}")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<12} {'-':>10} {result['p50_ms']:9.2f}ms {'new':>8}")
+            continue
+        change = result['p50_ms'] / before['p50_ms'] - 1 if before['p50_ms'] else 0.0
+        flag = ""
+        if change > max_regression:
+            regressed.append(name)
+            flag = "  slower"
+        print(f"{name:<12} {before['p50_ms']:9.2f}ms {result['p50_ms']:9.2f}ms {change:+7.1%}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fixtures', help="glob of recorded /v2/everything responses (instead of synthetic)")
+    parser.add_argument('--articles', type=int, default=1000, help="synthetic corpus size")
+    parser.add_argument('--mix', nargs='+', default=[], help="TOPIC=WEIGHT pairs (default: default topics)")
+    parser.add_argument('--summary-sections', type=int, default=8, help="sections in the md_to_html input")
+    parser.add_argument('--stages', nargs='+', help="only these stages")
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save-baseline', help="write results to this JSON file")
+    parser.add_argument('--baseline', help="compare against this JSON file")
+    parser.add_argument('--max-regression', type=float, default=0.2, help="allowed p50 slowdown, as a fraction")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    topics = list(mix) or DEFAULT_TOPICS
+    if args.fixtures:
+        raw_articles = load_fixtures(args.fixtures)
+        if not raw_articles:
+            sys.exit(f"No articles in {args.fixtures}")
+        corpus = f"fixtures {args.fixtures}"
+    else:
+        raw_articles = synthetic_corpus(args.articles, mix, seed=args.seed)
+        corpus = f"synthetic, seed {args.seed}"
+    summary_markdown = synthetic_summary(args.summary_sections, seed=args.seed)
+
+    stages = build_stages(raw_articles, topics, summary_markdown)
+    if args.stages:
+        unknown = set(args.stages) - set(stages)
+        if unknown:
+            sys.exit(f"Unknown stages: {', '.join(sorted(unknown))} (have {', '.join(stages)})")
+        stages = {name: stages[name] for name in args.stages}
+
+    print(f"{len(raw_articles)} articles ({corpus}), {len(topics)} topics, {args.repeat} runs per stage")
+    print(f"{'stage':<12} {'items':>6} {'items/s':>12} {'p50':>10} {'p99':>10}")
+    results = {}
+    for name, (setup, run, items) in stages.items():
+        result = measure(setup, run, items, args.repeat)
+        results[name] = result
+        print(f"{name:<12} {items:6d} {result['items_per_s']:12,.0f} "
+              f"{result['p50_ms']:8.2f}ms {result['p99_ms']:8.2f}ms")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'articles': len(raw_articles),
+                'corpus': corpus,
+                'stages': results,
+            }, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('articles') != len(raw_articles):
+            print(f"\nNote: baseline ran on {baseline.get('articles')} articles, this run on {len(raw_articles)}")
+        regressed = compare(results, baseline['stages'], args.max_regression)
+        if regressed:
+            sys.exit(f"\nSlower than baseline by more than {args.max_regression:.0%}: {', '.join(regressed)}")
+
+
+if __name__ == '__main__':
+    main()
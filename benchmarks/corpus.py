@@ -0,0 +1,179 @@
+"""Inputs for the benchmarks: synthetic corpora and recorded NewsAPI fixtures.
+
+    python benchmarks/corpus.py generate --articles 2000 --mix AI=3 Economy=1 -o big.json
+    NEWS_API_KEYS=... python benchmarks/corpus.py record --topics AI Tech --from 2025-01-09 --to 2025-01-10
+
+Both write /v2/everything response JSON (``status``, ``totalResults``,
+``articles``), so a fixture replays through the same conversion and
+pipeline as a live fetch. ``record`` saves one file per topic from the live
+API and needs keys in the environment; ``generate`` needs nothing.
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from topics import DEFAULT_TOPICS, TOPIC_KEYWORDS  # noqa: E402
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+SOURCES = [
+    ('reuters', 'Reuters'), ('associated-press', 'Associated Press'), ('bloomberg', 'Bloomberg'),
+    ('axios', 'Axios'), ('politico', 'Politico'), ('bbc-news', 'BBC News'), ('cnbc', 'CNBC'),
+    ('business-insider', 'Business Insider'), ('techcrunch', 'TechCrunch'), ('the-verge', 'The Verge'),
+]
+FILLER = (
+    "the a report says officials on monday after week new plan deal talks amid growing concerns over "
+    "results quarter announced company said people familiar with matter expected to analysts investors "
+    "government market shares record first since early data showed"
+).split()
+# Literal phrases that trip the opinion signals
+OPINION_PHRASES = ["opinion:", "op-ed", "editorial", "column:", "why i think", "review:"]
+
+
+def parse_mix(pairs):
+    """``["AI=3", "Economy"]`` -> ``{"AI": 3.0, "Economy": 1.0}``."""
+    mix = {}
+    for pair in pairs:
+        topic, _, weight = pair.partition('=')
+        mix[topic] = float(weight or 1)
+    return mix
+
+
+def synthetic_corpus(n, topic_mix=None, duplicate_rate=0.25, opinion_rate=0.1, untagged_rate=0.1,
+                     end=datetime(2025, 1, 10, 23, 0), days=2, seed=0):
+    """``n`` NewsAPI article dicts, newest first.
+
+    Each article mentions keywords from one or two topics drawn by
+    ``topic_mix`` weights (default: the default topics, evenly).
+    ``duplicate_rate`` of them are lightly reworded copies of an earlier
+    story from another outlet, ``opinion_rate`` carry an opinion marker and
+    ``untagged_rate`` match no topic.
+    """
+    rng = random.Random(seed)
+    topic_mix = topic_mix or {topic: 1 for topic in DEFAULT_TOPICS}
+    topics, weights = list(topic_mix), list(topic_mix.values())
+    span = days * 24 * 3600
+    articles = []
+    for i in range(n):
+        source_id, source_name = rng.choice(SOURCES)
+        if articles and rng.random() < duplicate_rate:
+            original = rng.choice(articles[-50:])
+            words = original['title'].split()
+            words[rng.randrange(len(words))] = rng.choice(FILLER)
+            title, description = ' '.join(words), original['description']
+        else:
+            words = rng.choices(FILLER, k=rng.randint(8, 14))
+            if rng.random() >= untagged_rate:
+                for topic in rng.choices(topics, weights, k=rng.randint(1, 2)):
+                    keyword = rng.choice(TOPIC_KEYWORDS.get(topic, [topic.lower()]))
+                    words.insert(rng.randrange(len(words)), keyword)
+            if rng.random() < opinion_rate:
+                words.insert(0, rng.choice(OPINION_PHRASES))
+            title = ' '.join(words).capitalize()
+            description = ' '.join(rng.choices(FILLER, k=rng.randint(20, 35)))
+        published = end - timedelta(seconds=span * i // max(n, 1))
+        articles.append({
+            'source': {'id': source_id, 'name': source_name},
+            'author': None,
+            'title': title,
+            'description': description,
+            'url': f"https://{source_id}.example.com/{i}",
+            'urlToImage': f"https://{source_id}.example.com/{i}.jpg" if rng.random() < 0.8 else None,
+            'publishedAt': published.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'content': ' '.join(rng.choices(FILLER, k=35)) + f"… [+{rng.randint(500, 5000)} chars]",
+        })
+    return articles
+
+
+def synthetic_summary(sections, bullets=4, seed=0):
+    """Markdown shaped like a detailed-mode AI Overview."""
+    rng = random.Random(seed)
+    lines = []
+    for topic in (DEFAULT_TOPICS * (sections // len(DEFAULT_TOPICS) + 1))[:sections]:
+        lines += [f"## {topic}", ""]
+        for _ in range(bullets):
+            words = rng.choices(FILLER, k=rng.randint(18, 30))
+            lines.append(f"- **{' '.join(words[:3]).title()}**: {' '.join(words[3:])} *per {rng.choice(SOURCES)[1]}*.")
+        lines += ["", "---", ""]
+    return '\n'.join(lines)
+
+
+def everything_response(articles):
+    return {'status': 'ok', 'totalResults': len(articles), 'articles': articles}
+
+
+def load_fixtures(pattern=os.path.join(FIXTURE_DIR, '*.json')):
+    """Articles from every recorded response matching ``pattern``, newest first."""
+    articles = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path) as f:
+            articles.extend(json.load(f).get('articles', []))
+    articles.sort(key=lambda a: a.get('publishedAt') or "", reverse=True)
+    return articles
+
+
+def write_response(path, articles):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(everything_response(articles), f, ensure_ascii=False, indent=1)
+        f.write("\n")
+
+
+def record(topics, sources, from_date, to_date, output_dir):
+    """Save each topic's live /v2/everything response (all pages) to ``output_dir``."""
+    import newsapi
+    from news_pipeline import NewsPipeline, build_api_query, build_request_params
+
+    pipeline = NewsPipeline(os.environ)
+    if not pipeline.scheduler.api_keys:
+        sys.exit("No NewsAPI keys: set NEWS_API_KEY_1 (..._3) or NEWS_API_KEYS")
+    for topic in topics:
+        params = build_request_params(build_api_query(topic), sources, from_date, to_date)
+        data = newsapi.get_everything_paged(
+            params, pipeline.scheduler, max_articles=pipeline.max_articles_per_topic, url=pipeline.newsapi_url)
+        if data is None:
+            print(f"{topic}: every key failed, skipped")
+            continue
+        path = os.path.join(output_dir, f"{topic.lower().replace(' ', '-')}_{from_date}_{to_date}.json")
+        write_response(path, data.get('articles', []))
+        print(f"{topic}: {len(data.get('articles', []))} articles -> {path}")
+
+
+def main():
+    from sources import DEFAULT_SOURCES
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate = commands.add_parser('generate', help="write a synthetic response")
+    generate.add_argument('--articles', type=int, default=500)
+    generate.add_argument('--mix', nargs='+', default=[], help="TOPIC=WEIGHT pairs (default: default topics)")
+    generate.add_argument('--duplicate-rate', type=float, default=0.25)
+    generate.add_argument('--opinion-rate', type=float, default=0.1)
+    generate.add_argument('--seed', type=int, default=0)
+    generate.add_argument('-o', '--output', required=True)
+
+    rec = commands.add_parser('record', help="save live NewsAPI responses as fixtures")
+    rec.add_argument('--topics', nargs='+', default=DEFAULT_TOPICS)
+    rec.add_argument('--sources', nargs='+', default=DEFAULT_SOURCES)
+    rec.add_argument('--from', dest='from_date', type=date.fromisoformat, required=True)
+    rec.add_argument('--to', dest='to_date', type=date.fromisoformat, required=True)
+    rec.add_argument('--output-dir', default=FIXTURE_DIR)
+    args = parser.parse_args()
+
+    if args.command == 'generate':
+        articles = synthetic_corpus(args.articles, parse_mix(args.mix), args.duplicate_rate, args.opinion_rate,
+                                    seed=args.seed)
+        write_response(args.output, articles)
+        print(f"{len(articles)} articles -> {args.output}")
+    else:
+        record(args.topics, args.sources, args.from_date, args.to_date, args.output_dir)
+
+
+if __name__ == '__main__':
+    main()
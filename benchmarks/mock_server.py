@@ -0,0 +1,389 @@
+"""Local stand-in for NewsAPI and Gemini, for load tests without network or quota.
+
+    python benchmarks/mock_server.py --port 8765 --latency 0.2 --jitter 0.1 --failure-rate 0.05
+
+then point the app (or news_pipeline.py) at it in .streamlit/secrets.toml
+or the environment:
+
+    NEWSAPI_URL = "http://127.0.0.1:8765/v2/everything"
+    GEMINI_API_ENDPOINT = "http://127.0.0.1:8765"
+
+``GET /v2/everything`` follows the NewsAPI contract: ``apiKey`` (or an
+``X-Api-Key`` header) is required, ``page``/``pageSize`` page through
+``totalResults`` newest-first articles dated inside ``from``..``to``, and
+errors come back as ``{"status": "error", "code": ..., "message": ...}``
+with NewsAPI's statuses: 401 for a missing or unknown key, 426
+``maximumResultsReached`` past ``--max-results``, 429 ``rateLimited`` over
+``--rate-limit`` requests per key per minute and ``apiKeyExhausted`` past
+``--daily-quota``. Articles are generated deterministically from the query
+and its keywords, so the same request always gets the same answer.
+
+``POST /v1beta/models/<model>:generateContent`` and ``:streamGenerateContent``
+answer the Gemini REST API with a markdown summary of the article lines in
+the prompt; the streaming form sends it in chunks ``--stream-delay`` apart.
+
+``--failure-rate`` of all requests fail with one of ``--failure-statuses``
+(retryable 5xx by default). ``GET /stats`` returns request counts by
+endpoint and status.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import re
+import socket
+import sys
+import threading
+import time
+import zlib
+from collections import Counter, defaultdict, deque
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from corpus import FILLER, SOURCES  # noqa: E402
+
+DEFAULT_TOTAL_RESULTS = 200
+MAX_PAGE_SIZE = 100
+GEMINI_PATH = re.compile(r'^/v1(?:beta)?/models/([^/:]+):(generateContent|streamGenerateContent)$')
+PROMPT_LINE = re.compile(r'^Categories: \[([^\]]*)\] \| Sources: (\d+) \| Title: (.*?) \| Desc: ')
+SOURCE_NAMES = dict(SOURCES)
+
+
+def query_keywords(q):
+    """``'"ai" OR "openai"'`` -> ``['ai', 'openai']``."""
+    return re.findall(r'"([^"]+)"', q) or q.split() or ["news"]
+
+
+def parse_day(value, default):
+    try:
+        return datetime.strptime(value[:10], '%Y-%m-%d')
+    except (TypeError, ValueError):
+        return default
+
+
+def generate_articles(q, sources, from_day, to_day, total_results):
+    """``total_results`` articles matching ``q``, newest first, spread over the window."""
+    rng = random.Random(zlib.crc32(f"{q}|{','.join(sources)}|{from_day:%F}|{to_day:%F}".encode()))
+    keywords = query_keywords(q)
+    source_ids = sources or [source_id for source_id, _ in SOURCES]
+    newest = to_day + timedelta(hours=23, minutes=59)
+    span = (newest - from_day).total_seconds()
+    articles = []
+    for i in range(total_results):
+        source_id = rng.choice(source_ids)
+        words = rng.choices(FILLER, k=rng.randint(8, 14))
+        words.insert(rng.randrange(len(words)), rng.choice(keywords))
+        published = newest - timedelta(seconds=span * i / max(total_results, 1))
+        articles.append({
+            'source': {'id': source_id, 'name': SOURCE_NAMES.get(source_id, source_id.replace('-', ' ').title())},
+            'author': None,
+            'title': f"{' '.join(words).capitalize()} ({i})",
+            'description': ' '.join(rng.choices(FILLER, k=rng.randint(20, 35))),
+            'url': f"https://{source_id}.example.com/{zlib.crc32(q.encode()):x}/{i}",
+            'urlToImage': f"https://{source_id}.example.com/{i}.jpg",
+            'publishedAt': published.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'content': ' '.join(rng.choices(FILLER, k=35)) + f"… [+{rng.randint(500, 5000)} chars]",
+        })
+    return articles
+
+
+def mock_summary(prompt):
+    """Markdown bullets for the article lines in a summary prompt, grouped by first category."""
+    groups = defaultdict(list)
+    for line in prompt.splitlines():
+        match = PROMPT_LINE.match(line)
+        if match:
+            category = match.group(1).split(',')[0].strip() or "General"
+            groups[category].append((int(match.group(2)), match.group(3)))
+    if not groups:
+        return "- **No articles** were provided."
+    # Per-topic prompts ask for bullets without a header
+    per_topic = "Do not add a header" in prompt
+    lines = []
+    for category, items in groups.items():
+        if not per_topic:
+            lines += [f"## {category}", ""]
+        for source_count, title in sorted(items, reverse=True)[:5]:
+            lines.append(f"- **{title}** (reported by {source_count} outlet{'s' if source_count > 1 else ''}).")
+        lines.append("")
+    return '\n'.join(lines).strip()
+
+
+def gemini_chunk(text, finish=False):
+    candidate = {'content': {'parts': [{'text': text}], 'role': 'model'}, 'index': 0}
+    if finish:
+        candidate['finishReason'] = 'STOP'
+    return {'candidates': [candidate]}
+
+
+class MockState:
+    """Configuration plus thread-safe counters shared by the handler threads."""
+
+    def __init__(self, latency=0.0, jitter=0.0, failure_rate=0.0, failure_statuses=(500, 502, 503),
+                 total_results=DEFAULT_TOTAL_RESULTS, max_results=0, rate_limit=0, daily_quota=0,
+                 keys=(), model_latency=0.5, stream_delay=0.05, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.failure_statuses = tuple(failure_statuses)
+        self.total_results = total_results
+        self.max_results = max_results
+        self.rate_limit = rate_limit
+        self.daily_quota = daily_quota
+        self.keys = set(keys)
+        self.model_latency = model_latency
+        self.stream_delay = stream_delay
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recent = defaultdict(deque)
+        self._used = Counter()
+        self._articles = {}
+        self.counts = Counter()
+
+    def delay(self, base):
+        with self._lock:
+            extra = self._rng.uniform(0, self.jitter) if self.jitter else 0.0
+        time.sleep(base + extra)
+
+    def injected_failure(self):
+        with self._lock:
+            if self.failure_rate and self._rng.random() < self.failure_rate:
+                return self._rng.choice(self.failure_statuses)
+        return None
+
+    def admit(self, api_key):
+        """None if ``api_key`` may make a request now, else (status, code, message)."""
+        if not api_key:
+            return 401, 'apiKeyMissing', "Your API key is missing."
+        if self.keys and api_key not in self.keys:
+            return 401, 'apiKeyInvalid', "Your API key is invalid or incorrect."
+        now = time.monotonic()
+        with self._lock:
+            if self.daily_quota and self._used[api_key] >= self.daily_quota:
+                return 429, 'apiKeyExhausted', "Your API key has no more requests available."
+            recent = self._recent[api_key]
+            while recent and now - recent[0] > 60:
+                recent.popleft()
+            if self.rate_limit and len(recent) >= self.rate_limit:
+                return 429, 'rateLimited', "You have made too many requests recently."
+            recent.append(now)
+            self._used[api_key] += 1
+        return None
+
+    def articles_for(self, q, sources, from_day, to_day):
+        key = (q, tuple(sources), from_day, to_day)
+        with self._lock:
+            articles = self._articles.get(key)
+        if articles is None:
+            articles = generate_articles(q, sources, from_day, to_day, self.total_results)
+            with self._lock:
+                self._articles[key] = articles
+        return articles
+
+    def count(self, endpoint, status):
+        with self._lock:
+            self.counts[f"{endpoint} {status}"] += 1
+
+    def stats(self):
+        with self._lock:
+            return {'requests': dict(self.counts), 'keys_used': dict(self._used)}
+
+
+def make_handler(state):
+    class MockHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def send_json(self, endpoint, status, payload, headers=()):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+            state.count(endpoint, status)
+
+        def newsapi_error(self, status, code, message, headers=()):
+            self.send_json('everything', status, {'status': 'error', 'code': code, 'message': message}, headers)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == '/stats':
+                self.send_json('stats', 200, state.stats())
+            elif url.path == '/v2/everything':
+                self.everything(parse_qs(url.query))
+            else:
+                self.send_json('unknown', 404, {'status': 'error', 'code': 'notFound', 'message': url.path})
+
+        def everything(self, query):
+            state.delay(state.latency)
+            failure = state.injected_failure()
+            if failure == 429:
+                self.newsapi_error(429, 'rateLimited', "Injected rate limit.", [('Retry-After', '1')])
+                return
+            if failure:
+                self.newsapi_error(failure, 'unexpectedError', "Injected failure.")
+                return
+
+            api_key = query.get('apiKey', [None])[0] or self.headers.get('X-Api-Key')
+            rejected = state.admit(api_key)
+            if rejected:
+                self.newsapi_error(*rejected)
+                return
+
+            q = query.get('q', [''])[0]
+            if not q and not query.get('sources'):
+                self.newsapi_error(400, 'parametersMissing', "Required parameters are missing: q, sources.")
+                return
+            try:
+                page = int(query.get('page', ['1'])[0])
+                page_size = int(query.get('pageSize', [str(MAX_PAGE_SIZE)])[0])
+            except ValueError:
+                self.newsapi_error(400, 'parameterInvalid', "page and pageSize must be integers.")
+                return
+            if page < 1 or not 1 <= page_size <= MAX_PAGE_SIZE:
+                self.newsapi_error(400, 'parameterInvalid', f"pageSize must be between 1 and {MAX_PAGE_SIZE}.")
+                return
+            if state.max_results and page * page_size > state.max_results:
+                self.newsapi_error(426, 'maximumResultsReached',
+                                   f"You have requested too many results. Limited to {state.max_results}.")
+                return
+
+            sources = [s for s in query.get('sources', [''])[0].split(',') if s]
+            to_day = parse_day(query.get('to', [None])[0], datetime(2025, 1, 10))
+            from_day = parse_day(query.get('from', [None])[0], to_day - timedelta(days=1))
+            articles = state.articles_for(q, sources, from_day, to_day)
+            first = (page - 1) * page_size
+            self.send_json('everything', 200, {
+                'status': 'ok',
+                'totalResults': len(articles),
+                'articles': articles[first:first + page_size],
+            })
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            match = GEMINI_PATH.match(url.path)
+            body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            if not match:
+                self.send_json('unknown', 404, {'error': {'code': 404, 'message': url.path, 'status': 'NOT_FOUND'}})
+                return
+            endpoint = match.group(2)
+
+            failure = state.injected_failure()
+            if failure:
+                state.delay(state.latency)
+                self.send_json(endpoint, failure, {'error': {
+                    'code': failure, 'message': "Injected failure.",
+                    'status': 'RESOURCE_EXHAUSTED' if failure == 429 else 'UNAVAILABLE',
+                }})
+                return
+            try:
+                request = json.loads(body or b'{}')
+                prompt = '\n'.join(
+                    part.get('text', '')
+                    for content in request.get('contents', [])
+                    for part in content.get('parts', [])
+                )
+            except (ValueError, AttributeError):
+                self.send_json(endpoint, 400, {'error': {'code': 400, 'message': "Invalid JSON payload.",
+                                                         'status': 'INVALID_ARGUMENT'}})
+                return
+
+            text = mock_summary(prompt)
+            state.delay(state.model_latency)
+            if endpoint == 'generateContent':
+                self.send_json(endpoint, 200, gemini_chunk(text, finish=True))
+            else:
+                self.stream(endpoint, text, 'sse' in url.query)
+
+        def stream(self, endpoint, text, sse):
+            """Send ``text`` in line-sized chunks, as SSE events or as one JSON array."""
+            pieces = text.splitlines(keepends=True)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream' if sse else 'application/json')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+
+            def write(data):
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            if not sse:
+                write(b'[')
+            for i, piece in enumerate(pieces):
+                if i:
+                    time.sleep(state.stream_delay)
+                chunk = json.dumps(gemini_chunk(piece, finish=i == len(pieces) - 1))
+                if sse:
+                    write(f"data: {chunk}\r\n\r\n".encode())
+                else:
+                    write((',' if i else '').encode() + chunk.encode())
+            if not sse:
+                write(b']')
+            self.wfile.write(b"0\r\n\r\n")
+            state.count(endpoint, 200)
+
+        def log_message(self, *args):
+            pass
+
+    return MockHandler
+
+
+def serve(port, options, host='127.0.0.1'):
+    ThreadingHTTPServer((host, port), make_handler(MockState(**options))).serve_forever()
+
+
+def start_mock_server(latency=0.0, total_results=DEFAULT_TOTAL_RESULTS, **options):
+    """Run the server in its own process (so its threads don't skew the
+    client's) on a free port; returns (process, port)."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    options = {'latency': latency, 'total_results': total_results, **options}
+    process = multiprocessing.Process(target=serve, args=(port, options), daemon=True)
+    process.start()
+    for _ in range(100):
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    return process, port
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.1, help="NewsAPI response delay in seconds")
+    parser.add_argument('--jitter', type=float, default=0.0, help="extra random delay, up to this many seconds")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument('--failure-statuses', type=int, nargs='+', default=[500, 502, 503])
+    parser.add_argument('--total-results', type=int, default=DEFAULT_TOTAL_RESULTS, help="totalResults per query")
+    parser.add_argument('--max-results', type=int, default=0, help="426 past this many results (0: no cap)")
+    parser.add_argument('--rate-limit', type=int, default=0, help="requests per key per minute (0: no limit)")
+    parser.add_argument('--daily-quota', type=int, default=0, help="requests per key (0: no limit)")
+    parser.add_argument('--keys', nargs='+', default=[], help="accepted API keys (default: any)")
+    parser.add_argument('--model-latency', type=float, default=0.5, help="Gemini delay before the first chunk")
+    parser.add_argument('--stream-delay', type=float, default=0.05, help="delay between streamed chunks")
+    parser.add_argument('--seed', type=int, help="seed for injected failures and jitter")
+    args = parser.parse_args()
+
+    options = {name: getattr(args, name) for name in (
+        'latency', 'jitter', 'failure_rate', 'failure_statuses', 'total_results', 'max_results',
+        'rate_limit', 'daily_quota', 'keys', 'model_latency', 'stream_delay', 'seed',
+    )}
+    print(f"Mock NewsAPI at http://{args.host}:{args.port}/v2/everything, Gemini at http://{args.host}:{args.port}")
+    try:
+        serve(args.port, options, args.host)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""Concurrent sessions share NewsAPI requests and model calls.
+
+    python -m pytest -q benchmarks/test_single_flight.py
+
+N threads start on one barrier and run ``NewsPipeline.fetch`` (on both
+fetch engines, whose NewsAPI requests go through the ``requests`` flight)
+or ``generate_summary`` (through the ``summaries`` flight) against a local
+mock server, over the default date window, which includes today. The
+upstream counts from its ``/stats`` must match what a single session costs.
+"""
+import os
+import pickle
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from mock_server import start_mock_server  # noqa: E402
+from news_pipeline import NewsPipeline, default_date_window, summary_date_context  # noqa: E402
+from sources import DEFAULT_SOURCES  # noqa: E402
+from topics import DEFAULT_TOPICS  # noqa: E402
+
+SESSIONS = 8
+
+
+@pytest.fixture(scope='module')
+def mock_port():
+    server, port = start_mock_server(latency=0.2, model_latency=0.3, stream_delay=0.02)
+    yield port
+    server.terminate()
+
+
+def upstream_counts(port):
+    return requests.get(f"http://127.0.0.1:{port}/stats", timeout=5).json()['requests']
+
+
+def make_pipeline(port, tmp_path, **settings):
+    tmp_path.mkdir(exist_ok=True)
+    return NewsPipeline({
+        'NEWS_API_KEYS': "k1,k2,k3",
+        'NEWS_API_DAILY_QUOTA': "1000000",
+        'NEWSAPI_URL': f"http://127.0.0.1:{port}/v2/everything",
+        'GEMINI_API_KEY': "test",
+        'GEMINI_API_ENDPOINT': f"http://127.0.0.1:{port}",
+        'ARTICLE_STORE_PATH': str(tmp_path / 'articles.db'),
+        'KEY_STATE_PATH': str(tmp_path / 'keys.json'),
+        'SUMMARY_CACHE_PATH': "",
+        **settings,
+    })
+
+
+def run_sessions(n, fn):
+    """``fn()`` on ``n`` threads released together; returns each thread's result."""
+    barrier = threading.Barrier(n)
+
+    def session(_):
+        barrier.wait()
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=n) as executor:
+        return list(executor.map(session, range(n)))
+
+
+def costs(port, tmp_path, n, fn_for_pipeline, **settings):
+    """({endpoint status: upstream calls}, session results, pipeline) for
+    ``n`` sessions sharing one fresh pipeline."""
+    pipeline = make_pipeline(port, tmp_path, **settings)
+    before = upstream_counts(port)
+    results = run_sessions(n, lambda: fn_for_pipeline(pipeline))
+    after = upstream_counts(port)
+    calls = {key: after.get(key, 0) - before.get(key, 0) for key in after if not key.startswith('stats')}
+    return {key: count for key, count in calls.items() if count}, results, pipeline
+
+
+def fetch_view(pipeline):
+    return [article.url for article in pipeline.fetch(DEFAULT_TOPICS, DEFAULT_SOURCES, *default_date_window())]
+
+
+@pytest.mark.parametrize('engine', ["threads", "asyncio"])
+def test_concurrent_fetches_share_newsapi_requests(mock_port, tmp_path, engine):
+    single, _, _ = costs(mock_port, tmp_path / 'one', 1, fetch_view, FETCH_ENGINE=engine)
+    shared, results, pipeline = costs(mock_port, tmp_path / 'many', SESSIONS, fetch_view, FETCH_ENGINE=engine)
+
+    assert single.get('everything 200', 0) >= len(DEFAULT_TOPICS)
+    assert shared == single
+    assert all(urls == results[0] for urls in results)
+    assert pipeline.counters()['coalesced_requests'] > 0
+
+
+@pytest.mark.parametrize('strategy, stream', [("map_reduce", True), ("single", True), ("single", False)])
+def test_concurrent_summaries_share_model_calls(mock_port, tmp_path, strategy, stream):
+    pytest.importorskip('google.generativeai')
+    from_date, to_date = default_date_window()
+    fetched = pickle.dumps(make_pipeline(mock_port, tmp_path / 'fetch').fetch(
+        DEFAULT_TOPICS, DEFAULT_SOURCES, from_date, to_date))
+    date_context = summary_date_context(from_date, to_date)
+
+    def summarize(pipeline):
+        # Each session processes its own copy, as each gets one from st.cache_data
+        processed, _ = pipeline.process(pickle.loads(fetched), DEFAULT_TOPICS)
+        plan, _ = pipeline.plan_summary(processed, DEFAULT_TOPICS)
+        return "".join(pipeline.generate_summary(plan, date_context, "brief", {}, stream=stream))
+
+    single, _, _ = costs(mock_port, tmp_path / 'one', 1, summarize, SUMMARY_STRATEGY=strategy)
+    shared, results, pipeline = costs(mock_port, tmp_path / 'many', SESSIONS, summarize, SUMMARY_STRATEGY=strategy)
+
+    assert sum(single.values()) >= 1
+    assert shared == single
+    assert all(summary == results[0] for summary in results)
+    assert pipeline.counters()['coalesced_summaries'] > 0
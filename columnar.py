@@ -0,0 +1,103 @@
+"""Columnar variant of ``pipeline.process_articles`` built on pandas.
+
+Fetched articles are loaded into a DataFrame once; the feed sort is a single
+stable ``sort_values`` and the opinion and topic checks run as
+``Series.str.contains`` over the whole text column, one pass per pattern.
+The text column is ``string[pyarrow]``, so those passes run in Arrow's C++
+kernels (RE2) rather than as a Python ``re`` call per row, which is what
+object dtype does. RE2's ``\\b`` and ``\\w`` only know ASCII word
+characters, so rows with a letter or digit outside ASCII ("café",
+"Élysée") are checked again with Python's ``re``, keeping the result the
+same as the loop's. Near-duplicate clustering still goes through
+``dedup.collapse_near_duplicates``: LSH bucketing and union-find are
+pointer-chasing, not column operations.
+"""
+import re
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from dedup import collapse_near_duplicates
+from text_matching import topic_pattern
+from topics import TOPIC_KEYWORDS
+
+TEXT_DTYPE = "string[pyarrow]"
+# A letter or digit outside ASCII: a word character to Python's re, not to RE2
+_NON_ASCII_WORD_CHAR = re.compile(r'[^\x00-\x7f](?<=\w)')
+
+
+def sort_newest_first(articles):
+    """``articles`` ordered by ``published_at`` descending, ties kept in input order."""
+    published = pd.Series([a.published_at for a in articles], dtype=object)
+    order = published.sort_values(ascending=False, kind='stable').index
+    return [articles[i] for i in order]
+
+
+def _contains(text, pattern, recheck_rows=()):
+    """Per-row ``re.search(pattern)`` as a bool array; ``recheck_rows`` are
+    positions to decide with Python's ``re`` instead of the column pass."""
+    # The opinion pattern uses groups to report which signal fired; they are
+    # irrelevant to a yes/no test, so silence pandas' match-groups warning.
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)
+        found = text.str.contains(pattern, regex=True).to_numpy(dtype=bool)
+    for position in recheck_rows:
+        found[position] = re.search(pattern, text.iat[position]) is not None
+    return found
+
+
+def non_ascii_rows(texts):
+    """Positions of ``texts`` whose word boundaries RE2 may place differently."""
+    # isascii() is a flag check, so the regex only runs on the few rows that
+    # have any non-ASCII character (most often just curly quotes or dashes)
+    return [i for i, t in enumerate(texts) if not t.isascii() and _NON_ASCII_WORD_CHAR.search(t)]
+
+
+def tag_masks(text, topic_names, keyword_map=TOPIC_KEYWORDS, recheck_rows=None):
+    """Topic bitmask per row of the lowercased ``text`` Series (bit i = topic_names[i])."""
+    if recheck_rows is None:
+        recheck_rows = non_ascii_rows(text.tolist())
+    dtype = np.int64 if len(topic_names) < 63 else object
+    masks = np.zeros(len(text), dtype=dtype)
+    for i, topic in enumerate(topic_names):
+        keywords = keyword_map.get(topic, [topic.lower()])
+        if not keywords:
+            continue
+        masks[_contains(text, topic_pattern(keywords), recheck_rows)] |= 1 << i
+    return masks
+
+
+def process_articles_columnar(raw_articles, applied_topics, hide_opinions, opinion_detector,
+                              keyword_map=TOPIC_KEYWORDS):
+    """Same contract and result as ``pipeline.process_articles``.
+
+    Opinion checks use the detector's compiled pattern directly, so they do
+    not go through its per-URL memo or update its signal hit counts.
+    """
+    topic_names = tuple(dict.fromkeys(applied_topics))
+
+    unique_articles = collapse_near_duplicates(sort_newest_first(raw_articles))
+    collapsed_count = len(raw_articles) - len(unique_articles)
+    if not unique_articles:
+        return [], collapsed_count
+
+    frame = pd.DataFrame({
+        'title': [a.title for a in unique_articles],
+        'description': [a.description for a in unique_articles],
+    }, dtype=TEXT_DTYPE)
+    text = (frame['title'] + ' ' + frame['description']).str.lower()
+
+    recheck_rows = non_ascii_rows(f"{a.title} {a.description}" for a in unique_articles)
+    masks = tag_masks(text, topic_names, keyword_map, recheck_rows)
+    keep = masks != 0
+    if hide_opinions:
+        keep &= ~_contains(text, opinion_detector.pattern, recheck_rows)
+
+    processed_articles = []
+    for position in np.flatnonzero(keep):
+        article = unique_articles[position]
+        article.topic_names = topic_names
+        article.tag_mask = int(masks[position])
+        processed_articles.append(article)
+    return processed_articles, collapsed_count
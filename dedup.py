@@ -0,0 +1,150 @@
+"""Near-duplicate detection for syndicated stories.
+
+Each article is fingerprinted with a MinHash signature over word shingles of
+its title and description. Signatures are split into LSH bands and bucketed,
+so only articles sharing a band are compared. Candidate pairs whose shingle
+Jaccard similarity clears the threshold, plus exact title repeats, are
+unioned into clusters. Work is roughly linear in the number of articles.
+"""
+import re
+import zlib
+
+# One-permutation MinHash: each shingle is hashed once and the low bits pick
+# one of NUM_BINS bins, keeping the minimum per bin. The hash is crc32, not
+# the per-process randomized str hash, so the same articles cluster the same
+# way in every process (and feed the same prompt and summary cache key).
+NUM_BINS = 32
+BIN_BITS = 5
+# 16 bands of 2 rows puts the LSH cutoff, (1/BANDS) ** (1/ROWS_PER_BAND),
+# at 0.25, well under SIMILARITY_THRESHOLD, so pairs just above the
+# threshold almost always become candidates.
+BANDS = 16
+ROWS_PER_BAND = NUM_BINS // BANDS
+SIMILARITY_THRESHOLD = 0.5
+_EMPTY = 1 << 64
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+def shingles(text, size=2):
+    """Set of word n-grams (single words for very short text)."""
+    words = _TOKEN.findall(text.lower())
+    if len(words) < size:
+        return set(words)
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash(shingle_set):
+    if not shingle_set:
+        return None
+    signature = [_EMPTY] * NUM_BINS
+    for gram in shingle_set:
+        h = zlib.crc32(gram.encode())
+        b = h & (NUM_BINS - 1)
+        v = h >> BIN_BITS
+        if v < signature[b]:
+            signature[b] = v
+
+    # Densify: an empty bin borrows from the next filled bin to its right,
+    # offset by the distance so borrowed values stay bin-specific.
+    filled = [b for b in range(NUM_BINS) if signature[b] != _EMPTY]
+    if len(filled) < NUM_BINS:
+        dense = list(signature)
+        for b in range(NUM_BINS):
+            if signature[b] == _EMPTY:
+                distance = 1
+                while signature[(b + distance) % NUM_BINS] == _EMPTY:
+                    distance += 1
+                dense[b] = signature[(b + distance) % NUM_BINS] + _EMPTY * distance
+        signature = dense
+    return tuple(signature)
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_articles(articles, threshold=SIMILARITY_THRESHOLD):
+    """Group near-duplicate articles.
+
+    Returns a list of clusters, each a list of indices into ``articles``, in
+    order of each cluster's first member.
+    """
+    parent = list(range(len(articles)))
+
+    def union(i, j):
+        root_i, root_j = _find(parent, i), _find(parent, j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    shingle_sets = []
+    buckets = {}
+    first_with_title = {}
+
+    for i, article in enumerate(articles):
+        title = article.title
+        if title in first_with_title:
+            union(first_with_title[title], i)
+        else:
+            first_with_title[title] = i
+
+        shingle_set = shingles(f"{title} {article.description}")
+        shingle_sets.append(shingle_set)
+        signature = minhash(shingle_set)
+        if signature is None:
+            continue
+        for band in range(BANDS):
+            key = (band, signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])
+            buckets.setdefault(key, []).append(i)
+
+    # Buckets are small in practice; each member is compared against earlier
+    # members of its bucket until it joins one of their clusters.
+    checked = set()
+    for members in buckets.values():
+        for position, j in enumerate(members[1:], start=1):
+            for i in members[:position]:
+                if _find(parent, i) == _find(parent, j) or (i, j) in checked:
+                    continue
+                checked.add((i, j))
+                if jaccard(shingle_sets[i], shingle_sets[j]) >= threshold:
+                    union(i, j)
+                    break
+
+    clusters = {}
+    for i in range(len(articles)):
+        clusters.setdefault(_find(parent, i), []).append(i)
+    return sorted(clusters.values(), key=lambda members: members[0])
+
+
+def collapse_near_duplicates(articles, threshold=SIMILARITY_THRESHOLD):
+    """Keep the first article of each cluster, recording the others on it.
+
+    The kept article's ``alternate_sources`` becomes a tuple of
+    ``(source_id, source_name, url)`` for the other outlets that ran the story
+    (one per source).
+    """
+    collapsed = []
+    for members in cluster_articles(articles, threshold):
+        lead = articles[members[0]]
+        seen_sources = {lead.source_id or lead.source_name}
+        alternates = []
+        for i in members[1:]:
+            other = articles[i]
+            source_key = other.source_id or other.source_name
+            if source_key in seen_sources:
+                continue
+            seen_sources.add(source_key)
+            alternates.append((other.source_id, other.source_name, other.url))
+        lead.alternate_sources = tuple(alternates)
+        collapsed.append(lead)
+    return collapsed
@@ -0,0 +1,117 @@
+"""Per-stage timings and counters, exportable as Prometheus text or JSONL.
+
+``Metrics.timer(stage)`` times a block into a rolling window per stage;
+``incr`` bumps a named counter. Collectors registered with
+``add_collector`` contribute the counters other components already keep
+(NewsAPI requests, summary cache hits, ...) at snapshot time, so nothing
+is counted twice. Timing is off unless enabled: a disabled ``timer``
+returns one shared no-op context manager, and counters are a locked
+integer add either way.
+"""
+import contextlib
+import json
+import threading
+import time
+from collections import deque
+
+from newsapi import percentile
+
+DEFAULT_WINDOW = 512
+_DISABLED = contextlib.nullcontext()
+
+
+class _Timer:
+    __slots__ = ('metrics', 'stage', 'started')
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.record(self.stage, time.perf_counter() - self.started)
+
+
+class Metrics:
+    def __init__(self, enabled=False, window=DEFAULT_WINDOW):
+        self.enabled = enabled
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._totals = {}
+        self._counters = {}
+        self._collectors = []
+
+    def timer(self, stage):
+        """Context manager recording the block's duration under ``stage``."""
+        return _Timer(self, stage) if self.enabled else _DISABLED
+
+    def record(self, stage, seconds):
+        if not self.enabled or seconds is None:
+            return
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+                self._totals[stage] = [0, 0.0]
+            samples.append(seconds)
+            totals = self._totals[stage]
+            totals[0] += 1
+            totals[1] += seconds
+
+    def incr(self, name, n=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def add_collector(self, collect):
+        """``collect()`` returns {counter_name: value}, read on each snapshot."""
+        self._collectors.append(collect)
+
+    def snapshot(self):
+        """{'stages': {stage: {count, total_s, p50_ms, p95_ms, p99_ms, max_ms}}, 'counters': {...}}."""
+        with self._lock:
+            samples = {stage: sorted(values) for stage, values in self._samples.items()}
+            totals = {stage: tuple(values) for stage, values in self._totals.items()}
+            counters = dict(self._counters)
+        for collect in self._collectors:
+            counters.update(collect())
+        stages = {
+            stage: {
+                'count': totals[stage][0],
+                'total_s': totals[stage][1],
+                'p50_ms': percentile(values, 50) * 1000,
+                'p95_ms': percentile(values, 95) * 1000,
+                'p99_ms': percentile(values, 99) * 1000,
+                'max_ms': values[-1] * 1000,
+            }
+            for stage, values in samples.items()
+        }
+        return {'stages': stages, 'counters': counters}
+
+
+def to_prometheus(snapshot, prefix='newsfeed'):
+    """Prometheus text exposition format: stages as a summary, counters as-is."""
+    lines = []
+    if snapshot['stages']:
+        name = f'{prefix}_stage_seconds'
+        lines += [f'# HELP {name} Duration of each pipeline stage (recent window quantiles).', f'# TYPE {name} summary']
+        for stage, stats in sorted(snapshot['stages'].items()):
+            for quantile, key in (('0.5', 'p50_ms'), ('0.95', 'p95_ms'), ('0.99', 'p99_ms')):
+                lines.append(f'{name}{{stage="{stage}",quantile="{quantile}"}} {stats[key] / 1000:.6f}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {stats["total_s"]:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {stats["count"]}')
+    for counter, value in sorted(snapshot['counters'].items()):
+        name = f'{prefix}_{counter}'
+        lines += [f'# TYPE {name} gauge', f'{name} {value}']
+    return '\n'.join(lines) + '\n'
+
+
+def to_jsonl(snapshot, now=None):
+    """One JSON object per stage and one for the counters, all stamped ``ts``."""
+    ts = round(time.time() if now is None else now, 3)
+    lines = [json.dumps({'ts': ts, 'stage': stage, **stats}) for stage, stats in sorted(snapshot['stages'].items())]
+    lines.append(json.dumps({'ts': ts, 'counters': snapshot['counters']}))
+    return '\n'.join(lines) + '\n'
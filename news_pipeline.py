@@ -0,0 +1,560 @@
+"""Headless fetch → process → summarize pipeline.
+
+``NewsPipeline`` owns the long-lived pieces (API key scheduler, article
+store, summary cache, opinion detector, single-flight groups) and runs each
+stage without importing Streamlit. The app keeps one per process in
+``st.cache_resource``, wraps its topic fetch in ``st.cache_data`` and renders
+the results; batch jobs use it directly. Run as a script to build a
+briefing as JSON, e.g. from cron:
+
+    NEWS_API_KEY_1=... GEMINI_API_KEY=... python news_pipeline.py \\
+        --topics AI Tech --from 2025-01-09 --to 2025-01-10 --output briefing.json
+
+Settings are read from any mapping with ``.get`` (``st.secrets`` in the app,
+``os.environ`` here) under the same names.
+"""
+import argparse
+import concurrent.futures
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import newsapi
+import prompt_builder
+import summarizer
+from metrics import Metrics, to_jsonl, to_prometheus
+from article_store import SETTLE_DAYS, ArticleStore, article_day, complete_days, plan_fetches, settled_before
+from articles import from_api_articles
+from pipeline import process_articles
+from singleflight import SingleFlight
+from sources import DEFAULT_SOURCES
+from summary_store import SummaryStore
+from text_matching import OPINION_SIGNALS, OpinionDetector
+from topics import DEFAULT_TOPICS, TOPIC_KEYWORDS
+
+GEMINI_MODEL = "gemini-3-flash-preview"
+SUMMARY_CACHE_SIZE = 256
+# The app's day runs on US Eastern time (UTC-5)
+DAY_OFFSET = timedelta(hours=5)
+STORE_RETENTION_DAYS = 30
+EMPTY_RESPONSE = "the model returned no text"
+
+
+def eastern_today():
+    return (datetime.now(timezone.utc) - DAY_OFFSET).date()
+
+
+def default_date_window():
+    """(start, end) of the date range a new session opens on: yesterday and today."""
+    today = eastern_today()
+    return today - timedelta(days=1), today
+
+
+def next_day_start(now):
+    """Epoch time of the next US Eastern midnight, when the default window rolls over."""
+    eastern_now = datetime.fromtimestamp(now, timezone.utc) - DAY_OFFSET
+    tomorrow = eastern_now.date() + timedelta(days=1)
+    return (datetime(tomorrow.year, tomorrow.month, tomorrow.day, tzinfo=timezone.utc) + DAY_OFFSET).timestamp()
+
+
+def summary_date_context(start_date, end_date):
+    return f"{start_date.strftime('%B %d')} and {end_date.strftime('%B %d')}"
+
+
+def build_api_query(topic, keyword_map=TOPIC_KEYWORDS):
+    keywords = keyword_map.get(topic, [topic.lower()])
+    capped_keywords = keywords[:5]
+    return " OR ".join(f'"{kw}"' for kw in capped_keywords)
+
+
+def build_request_params(query, sources, from_date, to_date):
+    return {
+        'q': query,
+        'searchIn': 'title,description',
+        'sources': ','.join(sources) if sources else '',
+        'from': from_date.strftime('%Y-%m-%d'),
+        'to': to_date.strftime('%Y-%m-%d'),
+        'language': 'en',
+        'sortBy': 'publishedAt',
+    }
+
+
+def setting_int(settings, name, default):
+    return int(settings.get(name, default))
+
+
+def setting_flag(settings, name, default):
+    return str(settings.get(name, default)).lower() in ("1", "true", "yes")
+
+
+class NewsPipeline:
+    def __init__(self, settings):
+        self.news_api_keys = [settings.get(f"NEWS_API_KEY_{i}") for i in (1, 2, 3)]
+        self.news_api_keys += [k for k in settings.get("NEWS_API_KEYS", "").split(',') if k]
+        self.gemini_api_key = settings.get("GEMINI_API_KEY")
+        # Alternative upstreams, e.g. benchmarks/mock_server.py for load tests
+        self.newsapi_url = settings.get("NEWSAPI_URL") or newsapi.EVERYTHING_URL
+        self.gemini_api_endpoint = settings.get("GEMINI_API_ENDPOINT")
+        self.max_articles_per_topic = setting_int(settings, "MAX_ARTICLES_PER_TOPIC", newsapi.MAX_ARTICLES)
+        # "threads" (default) or "asyncio"; the asyncio engine needs aiohttp
+        self.fetch_engine = settings.get("FETCH_ENGINE", "threads")
+        self.fetch_concurrency = setting_int(settings, "FETCH_CONCURRENCY", 16)
+        # "loop" (default) or "pandas" for the columnar processing pipeline (needs pyarrow)
+        self.processing_engine = settings.get("PROCESSING_ENGINE", "loop")
+        # "map_reduce" (default): one concurrent, separately cached call per
+        # topic, joined without a model call; "single": one call over the feed
+        self.summary_strategy = settings.get("SUMMARY_STRATEGY", "map_reduce")
+        self.summary_concurrency = setting_int(settings, "SUMMARY_CONCURRENCY", summarizer.DEFAULT_CONCURRENCY)
+        # Size limits for the article block sent to Gemini (tokens are estimated)
+        self.summary_token_budget = setting_int(settings, "SUMMARY_TOKEN_BUDGET", prompt_builder.DEFAULT_TOKEN_BUDGET)
+        self.summary_topic_token_budget = setting_int(
+            settings, "SUMMARY_TOPIC_TOKEN_BUDGET", prompt_builder.DEFAULT_TOPIC_TOKEN_BUDGET)
+        self.summary_max_per_category = setting_int(
+            settings, "SUMMARY_MAX_PER_CATEGORY", prompt_builder.DEFAULT_MAX_PER_CATEGORY)
+        self.summary_content_chars = setting_int(settings, "SUMMARY_CONTENT_CHARS", prompt_builder.DEFAULT_CONTENT_CHARS)
+
+        self.scheduler = newsapi.KeyScheduler(
+            self.news_api_keys,
+            settings.get("KEY_STATE_PATH", "newsapi_keys.json"),
+            daily_quota=setting_int(settings, "NEWS_API_DAILY_QUOTA", newsapi.DAILY_QUOTA),
+        )
+        self.store = ArticleStore(settings.get("ARTICLE_STORE_PATH", "article_store.db"))
+        self.store.prune(eastern_today() - timedelta(days=STORE_RETENTION_DAYS))
+        # Days before today still refetched for NewsAPI's indexing lag
+        self.store_settle_days = setting_int(settings, "STORE_SETTLE_DAYS", SETTLE_DAYS)
+        # Persistent summary cache; set the path to "" to keep summaries in memory only
+        summary_cache_path = settings.get("SUMMARY_CACHE_PATH", "summary_cache.db")
+        if summary_cache_path:
+            max_bytes = setting_int(settings, "SUMMARY_CACHE_MAX_MB", 50) * 1024 * 1024
+            self.summary_cache = SummaryStore(summary_cache_path, max_bytes)
+        else:
+            self.summary_cache = summarizer.SummaryCache(SUMMARY_CACHE_SIZE)
+        self.opinion_detector = OpinionDetector(OPINION_SIGNALS)
+        # Identical in-flight work is shared, one group per kind of call
+        self.flights = {'requests': SingleFlight(), 'summaries': SingleFlight()}
+        # Per-thread responses already fetched by the asyncio engine
+        self._context = threading.local()
+        self._genai = None
+        # Per-stage timings (off by default); counters are always kept
+        self.metrics = Metrics(enabled=setting_flag(settings, "METRICS", "false"))
+        self.metrics.add_collector(self.counters)
+
+    # --- fetch ---
+
+    def request_everything(self, query, sources, from_date, to_date):
+        """Query /v2/everything on the healthiest API keys, paging up to the
+        per-topic article budget. Returns the combined response JSON, or None if
+        every usable key failed."""
+        prefetched = getattr(self._context, 'prefetched', None) or {}
+        request_key = (query, tuple(sources), from_date, to_date)
+        if request_key in prefetched:
+            return prefetched[request_key]
+
+        params = build_request_params(query, sources, from_date, to_date)
+        # Callers making the same request at once (e.g. sessions on the
+        # threads engine) share one paged fetch
+        return self.flights['requests'].do(request_key, lambda: newsapi.get_everything_paged(
+            params, self.scheduler, max_articles=self.max_articles_per_topic, url=self.newsapi_url))
+
+    def plan_topic(self, query, sources, from_date, to_date):
+        """(covered, requests) for one topic: the article store's fully fetched
+        slots ({day: source ids}) and the (query, sources, from, to) requests
+        still needed from NewsAPI."""
+        if not sources:
+            return {}, [(query, tuple(sources), from_date, to_date)]
+
+        covered = self.store.covered_sources(query, sources, from_date, to_date)
+        return covered, [
+            (query, missing, run_start, run_end)
+            for run_start, run_end, missing in plan_fetches(sources, from_date, to_date, covered, self.unsettled_from())
+        ]
+
+    def unsettled_from(self):
+        """First day the article store does not treat as final yet."""
+        return settled_before(eastern_today(), self.store_settle_days)
+
+    def load_topic_articles(self, topic, sources, from_date, to_date):
+        """One topic's articles; past days already in the article store are served from disk."""
+        query = build_api_query(topic)
+
+        if not sources:
+            data = self.request_everything(query, sources, from_date, to_date)
+            return from_api_articles(data.get('articles', [])) if data else []
+
+        unsettled_from = self.unsettled_from()
+        # Reuse the plan a prefetch was made from: once another caller has
+        # saved coverage, planning again would ask for requests nobody fetched
+        plans = getattr(self._context, 'plans', None) or {}
+        covered, requests_needed = plans.get(query) or self.plan_topic(query, sources, from_date, to_date)
+        # Only slots that were covered when planning: a concurrent caller may
+        # since have stored the ones requested below
+        articles = [
+            a for a in self.store.load(query, sources, from_date, to_date)
+            if ((a.get('source') or {}).get('id') or '') in covered.get(date.fromisoformat(article_day(a)), ())
+        ]
+
+        for _, missing, run_start, run_end in requests_needed:
+            data = self.request_everything(query, missing, run_start, run_end)
+            if data is None:
+                continue
+            fetched = data.get('articles', [])
+            truncated = len(fetched) < data.get('totalResults', 0)
+            settled = complete_days(fetched, run_start, run_end, unsettled_from, truncated)
+            self.store.save(query, missing, fetched, settled)
+            articles.extend(fetched)
+
+        return from_api_articles(articles)
+
+    def fetch_topic(self, topic, sources, from_date, to_date):
+        """``load_topic_articles``, timed.
+
+        Not coalesced per topic: identical NewsAPI requests are shared in
+        ``request_everything``, and in the app ``st.cache_data`` holds a
+        per-key lock while computing besides.
+        """
+        with self.metrics.timer('fetch_topic'):
+            return self.load_topic_articles(topic, sources, from_date, to_date)
+
+    def prefetch_requests(self, request_keys):
+        """Fetch (query, sources, from, to) requests on the asyncio engine.
+
+        Requests another caller already has in flight are waited on, not
+        repeated. Returns {request_key: response JSON or None}.
+        """
+        import newsapi_async
+
+        flights = self.flights['requests']
+        claims = {key: flights.claim(key) for key in request_keys}
+        led_keys = [key for key, (_, is_leader) in claims.items() if is_leader]
+        if led_keys:
+            engine = newsapi_async.AsyncFetchEngine(
+                self.scheduler, self.fetch_concurrency, self.max_articles_per_topic, self.newsapi_url)
+            try:
+                with self.metrics.timer('newsapi_prefetch'):
+                    responses = engine.fetch_all([build_request_params(*key) for key in led_keys])
+            except BaseException as e:
+                for key in led_keys:
+                    flights.resolve(key, error=e)
+                raise
+            for key, response in zip(led_keys, responses):
+                flights.resolve(key, response)
+        return {key: future.result() for key, (future, _) in claims.items()}
+
+    def plan_topics(self, topics, sources, from_date, to_date):
+        """{query: plan_topic(...)} for every topic."""
+        queries = dict.fromkeys(build_api_query(topic) for topic in topics)
+        return {query: self.plan_topic(query, sources, from_date, to_date) for query in queries}
+
+    @staticmethod
+    def planned_requests(plans):
+        return list(dict.fromkeys(request_key for _, request_keys in plans.values() for request_key in request_keys))
+
+    @contextlib.contextmanager
+    def prefetched(self, plans, responses):
+        """On this thread, load topics by ``plans`` and serve
+        ``request_everything`` from ``responses``."""
+        self._context.plans = plans
+        self._context.prefetched = responses
+        try:
+            yield
+        finally:
+            self._context.plans = None
+            self._context.prefetched = None
+
+    def fetch(self, topics, sources, from_date, to_date):
+        """All topics' articles merged newest first, without any cache in front."""
+        topics = list(dict.fromkeys(topics or ["General"]))
+        sources = tuple(sorted(sources))
+
+        if self.fetch_engine == "asyncio":
+            plans = self.plan_topics(topics, sources, from_date, to_date)
+            responses = self.prefetch_requests(self.planned_requests(plans))
+            with self.prefetched(plans, responses):
+                results = [self.fetch_topic(topic, sources, from_date, to_date) for topic in topics]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+                results = list(executor.map(lambda topic: self.fetch_topic(topic, sources, from_date, to_date), topics))
+
+        all_articles = [article for res in results for article in res]
+        all_articles.sort(key=lambda x: x.published_at, reverse=True)
+        return all_articles
+
+    # --- process ---
+
+    def process(self, raw_articles, topics, hide_opinions=True):
+        """Dedup → opinion filter → classify; returns (processed_articles, collapsed_count)."""
+        if self.processing_engine == "pandas":
+            from columnar import process_articles_columnar as run_pipeline
+        else:
+            run_pipeline = process_articles
+        with self.metrics.timer('process'):
+            return run_pipeline(raw_articles, topics, hide_opinions, self.opinion_detector)
+
+    # --- summarize ---
+
+    def _model(self):
+        if self._genai is None:
+            import google.generativeai as genai
+            if self.gemini_api_endpoint:
+                genai.configure(api_key=self.gemini_api_key, transport="rest",
+                                client_options={"api_endpoint": self.gemini_api_endpoint})
+            else:
+                genai.configure(api_key=self.gemini_api_key)
+            self._genai = genai
+        return self._genai.GenerativeModel(GEMINI_MODEL)
+
+    def generate_summary_text(self, prompt):
+        with self.metrics.timer('model_call'):
+            text = self._model().generate_content(prompt).text
+        if not text:
+            raise ValueError(EMPTY_RESPONSE)
+        return text
+
+    def plan_summary(self, processed_articles, topics):
+        """(plan, prompt_report) for the summary strategy: per-topic sections
+        for map-reduce, or one prompt data string."""
+        if self.summary_strategy == "map_reduce":
+            topic_sections = summarizer.plan_topic_sections(
+                processed_articles,
+                topics,
+                token_budget=self.summary_topic_token_budget,
+                max_per_category=self.summary_max_per_category,
+                content_chars=self.summary_content_chars,
+            )
+            return topic_sections, prompt_builder.merge_reports(report for _, _, report in topic_sections)
+        return prompt_builder.build_prompt_data(
+            processed_articles,
+            token_budget=self.summary_token_budget,
+            max_per_category=self.summary_max_per_category,
+            content_chars=self.summary_content_chars,
+        )
+
+    def summary(self, prompt_data_string, date_context, summary_mode="brief"):
+        """One-call summary of ``prompt_data_string``, cached and shared by concurrent callers."""
+        if not prompt_data_string.strip():
+            return "No articles available to summarize."
+
+        key = summarizer.content_key(prompt_data_string, date_context, summary_mode)
+        summary = self.summary_cache.get(key)
+        if summary is not None:
+            return summary
+
+        def generate():
+            text = self.generate_summary_text(summarizer.summary_prompt(prompt_data_string, date_context, summary_mode))
+            self.summary_cache.put(key, text)
+            return text
+
+        try:
+            return self.flights['summaries'].do(key, generate)
+        except Exception as e:
+            return f"⚠️ An error occurred while generating the AI Overview: {e}"
+
+    def stream_summary(self, prompt_data_string, date_context, summary_mode, timing):
+        """Yield the one-call summary in chunks as Gemini produces it.
+
+        ``timing`` receives ``first_token_s`` and ``total_s`` (seconds since the
+        call) and ``cached``. A complete, non-empty stream is stored in the
+        summary cache, so a cached summary comes back as a single chunk.
+        """
+        started = time.perf_counter()
+        timing['cached'] = False
+        if not prompt_data_string.strip():
+            yield "No articles available to summarize."
+            return
+
+        key = summarizer.content_key(prompt_data_string, date_context, summary_mode)
+        summary = self.summary_cache.get(key)
+        if summary is not None:
+            timing.update(cached=True, first_token_s=time.perf_counter() - started)
+            timing['total_s'] = timing['first_token_s']
+            yield summary
+            return
+
+        # Another caller already streaming this summary: wait for it and
+        # return it whole rather than making a second model call
+        flights = self.flights['summaries']
+        future, is_leader = flights.claim(key)
+        if not is_leader:
+            try:
+                summary = future.result()
+            except Exception as e:
+                summary = f"⚠️ An error occurred while generating the AI Overview: {e}"
+            timing['first_token_s'] = timing['total_s'] = time.perf_counter() - started
+            yield summary
+            return
+
+        parts = []
+        try:
+            prompt = summarizer.summary_prompt(prompt_data_string, date_context, summary_mode)
+            for chunk in self._model().generate_content(prompt, stream=True):
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunks without text parts (e.g. a finish or safety marker)
+                    continue
+                if not text:
+                    continue
+                if 'first_token_s' not in timing:
+                    timing['first_token_s'] = time.perf_counter() - started
+                parts.append(text)
+                yield text
+            if not parts:
+                # Every chunk was blocked or empty: nothing worth caching
+                raise ValueError(EMPTY_RESPONSE)
+        except Exception as e:
+            flights.resolve(key, error=e)
+            timing['total_s'] = time.perf_counter() - started
+            yield f"\n\n⚠️ An error occurred while generating the AI Overview: {e}"
+            return
+        except BaseException:
+            # The caller stopped reading mid-stream (e.g. a rerun closed the generator)
+            flights.resolve(key, error=RuntimeError("the session generating this summary stopped"))
+            raise
+        timing['total_s'] = time.perf_counter() - started
+        summary = ''.join(parts)
+        self.summary_cache.put(key, summary)
+        flights.resolve(key, summary)
+
+    def generate_summary(self, summary_plan, date_context, summary_mode, timing, stream=True):
+        """Summary text chunks for a ``plan_summary`` plan; fills ``timing``."""
+        if self.summary_strategy == "map_reduce":
+            chunks = summarizer.map_reduce_summary(
+                summary_plan, date_context, summary_mode,
+                self.generate_summary_text, self.summary_cache, timing, self.summary_concurrency,
+                single_flight=self.flights['summaries'],
+            )
+        elif stream:
+            chunks = self.stream_summary(summary_plan, date_context, summary_mode, timing)
+        else:
+            generation_started = time.perf_counter()
+            summary = self.summary(summary_plan, date_context, summary_mode)
+            generation_time = time.perf_counter() - generation_started
+            timing.update(first_token_s=generation_time, total_s=generation_time, cached=False)
+            chunks = [summary]
+        return self._timed_summary(chunks, timing) if self.metrics.enabled else chunks
+
+    def _timed_summary(self, chunks, timing):
+        yield from chunks
+        self.metrics.record('summary_first_token', timing.get('first_token_s'))
+        self.metrics.record('summary', timing.get('total_s'))
+
+    def counters(self):
+        """Counters the pipeline's components keep themselves, for ``Metrics`` snapshots."""
+        api_stats = newsapi.STATS.snapshot()
+        key_health = self.scheduler.health()
+        cache_stats = self.summary_cache.stats()
+        opinion_stats = self.opinion_detector.stats()
+        counters = {
+            'newsapi_requests': api_stats['requests'],
+            'newsapi_retries': api_stats['retries'],
+            'newsapi_failures': api_stats['failures'],
+            'newsapi_p50_ms': round(api_stats['p50_ms'], 1),
+            'newsapi_p95_ms': round(api_stats['p95_ms'], 1),
+            'newsapi_keys_healthy': sum(k['healthy'] for k in key_health),
+            'newsapi_quota_remaining': sum(k['remaining'] for k in key_health),
+            'summary_cache_hits': cache_stats['hits'],
+            'summary_cache_misses': cache_stats['misses'],
+            'summary_cache_entries': cache_stats['entries'],
+            'summary_cache_bytes': cache_stats['bytes'],
+            'opinion_checked': opinion_stats['checked'],
+            'opinion_memo_hits': opinion_stats['memo_hits'],
+        }
+        for kind, flights in self.flights.items():
+            counters[f'coalesced_{kind}'] = flights.stats()['followers']
+        return counters
+
+    # --- end to end ---
+
+    def run(self, topics, sources, from_date, to_date, summary_mode="brief", hide_opinions=True, summarize=True):
+        """Fetch, process and (optionally) summarize; returns a JSON-ready dict."""
+        topics = list(dict.fromkeys(topics))
+        requests_before = newsapi.STATS.snapshot()['requests']
+
+        started = time.perf_counter()
+        with self.metrics.timer('fetch'):
+            raw_articles = self.fetch(topics, sources, from_date, to_date)
+        fetch_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        processed_articles, collapsed_count = self.process(raw_articles, topics, hide_opinions)
+        process_s = time.perf_counter() - started
+
+        briefing = {
+            'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'topics': topics,
+            'sources': sorted(sources),
+            'from': from_date.isoformat(),
+            'to': to_date.isoformat(),
+            'hide_opinions': hide_opinions,
+            'fetched': len(raw_articles),
+            'collapsed_duplicates': collapsed_count,
+            'articles': [article.as_dict() for article in processed_articles],
+            'summary': None,
+            'timings': {'fetch_s': round(fetch_s, 3), 'process_s': round(process_s, 3)},
+        }
+
+        if summarize and processed_articles:
+            started = time.perf_counter()
+            summary_plan, prompt_report = self.plan_summary(processed_articles, topics)
+            summary_timing = {}
+            summary_text = "".join(self.generate_summary(
+                summary_plan, summary_date_context(from_date, to_date), summary_mode, summary_timing, stream=False))
+            briefing['summary'] = {
+                'mode': summary_mode,
+                'strategy': self.summary_strategy,
+                'markdown': summary_text,
+                'prompt': prompt_report,
+                'cached': summary_timing.get('cached', False),
+                'model_calls': summary_timing.get('calls'),
+            }
+            briefing['timings']['summary_s'] = round(time.perf_counter() - started, 3)
+
+        briefing['newsapi_requests'] = newsapi.STATS.snapshot()['requests'] - requests_before
+        return briefing
+
+
+def main():
+    today_start, today_end = default_date_window()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--topics', nargs='+', default=DEFAULT_TOPICS)
+    parser.add_argument('--sources', nargs='+', default=DEFAULT_SOURCES, help="NewsAPI source ids")
+    parser.add_argument('--from', dest='from_date', type=date.fromisoformat, default=today_start)
+    parser.add_argument('--to', dest='to_date', type=date.fromisoformat, default=today_end)
+    parser.add_argument('--mode', choices=['brief', 'detailed'], default='brief')
+    parser.add_argument('--no-summary', action='store_true', help="skip the Gemini call")
+    parser.add_argument('--keep-opinions', action='store_true', help="don't filter out opinion pieces")
+    parser.add_argument('--output', help="write JSON here instead of stdout")
+    parser.add_argument('--metrics-out', help="write stage timings and counters here (.prom: Prometheus, else JSONL)")
+    args = parser.parse_args()
+
+    settings = dict(os.environ, METRICS="true") if args.metrics_out else os.environ
+    news_pipeline = NewsPipeline(settings)
+    if not news_pipeline.scheduler.api_keys:
+        sys.exit("No NewsAPI keys: set NEWS_API_KEY_1 (..._3) or NEWS_API_KEYS")
+    if not args.no_summary and not news_pipeline.gemini_api_key:
+        sys.exit("No GEMINI_API_KEY set (or pass --no-summary)")
+
+    briefing = news_pipeline.run(
+        args.topics, args.sources, args.from_date, args.to_date,
+        summary_mode=args.mode, hide_opinions=not args.keep_opinions, summarize=not args.no_summary,
+    )
+    output = json.dumps(briefing, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.metrics_out:
+        snapshot = news_pipeline.metrics.snapshot()
+        export = to_prometheus(snapshot) if args.metrics_out.endswith('.prom') else to_jsonl(snapshot)
+        with open(args.metrics_out, 'w') as f:
+            f.write(export)
+
+
+if __name__ == '__main__':
+    main()
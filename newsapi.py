@@ -0,0 +1,406 @@
+"""HTTP client for NewsAPI.
+
+All calls share one pooled ``requests.Session`` (keep-alive, thread-safe
+connection pool) with bounded connect/read timeouts. 429 and 5xx responses
+and connection errors are retried with jittered exponential backoff, and
+every attempt is recorded in ``STATS`` so fetch time can be broken down.
+
+``KeyScheduler`` spreads requests across the configured API keys, tracks each
+key's daily usage and error responses, and opens a circuit on keys that are
+rate limited or exhausted. Its state is persisted to a small JSON file so it
+survives reruns and restarts.
+"""
+import concurrent.futures
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+import requests
+from requests.adapters import HTTPAdapter
+
+EVERYTHING_URL = "https://newsapi.org/v2/everything"
+
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+POOL_SIZE = 20
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# 429s on a keyed call mean that key is rate limited: the scheduler moves on
+# to another key instead of retrying the same one.
+SERVER_ERROR_STATUSES = frozenset({500, 502, 503, 504})
+
+DAILY_QUOTA = 100
+RATE_LIMIT_COOLDOWN = 60 * 60
+ERROR_COOLDOWN = 60
+ERROR_THRESHOLD = 3
+# NewsAPI error codes that say the key itself is unusable for a while
+EXHAUSTED_CODES = frozenset({'apiKeyExhausted'})
+RATE_LIMITED_CODES = frozenset({'rateLimited'})
+DEAD_KEY_CODES = frozenset({'apiKeyInvalid', 'apiKeyDisabled', 'apiKeyMissing'})
+# Errors about the request itself; another key would get the same answer
+REQUEST_ERROR_CODES = frozenset({
+    'maximumResultsReached', 'parameterInvalid', 'parametersMissing',
+    'sourcesTooMany', 'sourceDoesNotExist',
+})
+
+PAGE_SIZE = 100
+MAX_ARTICLES = 500
+PAGE_CONCURRENCY = 4
+# Results per query the plan serves before answering maximumResultsReached
+# (100 on the Developer plan). Unknown until the first refusal, then kept
+# for the life of the process so later fetches never ask past it.
+RESULTS_CAP = None
+
+
+class RequestStats:
+    """Thread-safe counters and a rolling latency window for upstream calls."""
+
+    def __init__(self, window=500):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.status_counts = {}
+
+    def record(self, latency, status=None, retried=False):
+        with self._lock:
+            self.requests += 1
+            self._latencies.append(latency)
+            if retried:
+                self.retries += 1
+            key = status if status is not None else 'error'
+            self.status_counts[key] = self.status_counts.get(key, 0) + 1
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+
+    def snapshot(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            snap = {
+                'requests': self.requests,
+                'retries': self.retries,
+                'failures': self.failures,
+                'status_counts': dict(self.status_counts),
+            }
+        snap['p50_ms'] = percentile(latencies, 50) * 1000
+        snap['p95_ms'] = percentile(latencies, 95) * 1000
+        return snap
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+STATS = RequestStats()
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # Retries are handled in get_json so they can be counted
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=0)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Full-jitter exponential backoff, honouring a numeric Retry-After."""
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_CAP)
+        except ValueError:
+            pass
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+def get_json(url, params, max_retries=MAX_RETRIES, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+             retry_statuses=RETRY_STATUSES):
+    """GET ``url`` and return the decoded JSON body.
+
+    Raises ``requests.RequestException`` (or ``ValueError`` for a non-JSON
+    body) once retries are used up.
+    """
+    session = get_session()
+    for attempt in range(max_retries + 1):
+        retried = attempt > 0
+        started = time.perf_counter()
+        try:
+            response = session.get(url, params=params, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            STATS.record(time.perf_counter() - started, retried=retried)
+            if attempt == max_retries:
+                STATS.record_failure()
+                raise
+            time.sleep(backoff_delay(attempt))
+            continue
+
+        STATS.record(time.perf_counter() - started, response.status_code, retried=retried)
+        if response.status_code in retry_statuses and attempt < max_retries:
+            time.sleep(backoff_delay(attempt, response.headers.get('Retry-After')))
+            continue
+        if response.status_code in retry_statuses:
+            STATS.record_failure()
+        return response.json()
+
+
+def next_utc_midnight(now):
+    tomorrow = datetime.fromtimestamp(now, timezone.utc).date() + timedelta(days=1)
+    return datetime(tomorrow.year, tomorrow.month, tomorrow.day, tzinfo=timezone.utc).timestamp()
+
+
+def key_id(api_key):
+    """Stable identifier for a key that is safe to write to disk."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:12]
+
+
+class KeyScheduler:
+    """Hands out the healthiest API key for each request.
+
+    Keys whose circuit is open (rate limited, exhausted, invalid, or failing
+    repeatedly) are skipped until their cooldown passes. Among healthy keys the
+    one with the fewest in-flight requests, then the most quota left, wins, so
+    concurrent topic fetches spread across keys instead of piling onto key 1.
+    """
+
+    def __init__(self, api_keys, state_path=None, daily_quota=DAILY_QUOTA):
+        self.api_keys = [k for k in api_keys if k]
+        self.state_path = state_path
+        self.daily_quota = daily_quota
+        self._lock = threading.Lock()
+        self._in_flight = {k: 0 for k in self.api_keys}
+        self._state = {k: self._fresh_state() for k in self.api_keys}
+        self._load()
+
+    @staticmethod
+    def _fresh_state():
+        return {
+            'day': datetime.now(timezone.utc).date().isoformat(),
+            'used': 0,
+            'open_until': 0.0,
+            'consecutive_errors': 0,
+            'last_error': None,
+        }
+
+    # --- persistence ---
+
+    def _load(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        for api_key in self.api_keys:
+            if key_id(api_key) in saved:
+                self._state[api_key].update(saved[key_id(api_key)])
+
+    def _save(self):
+        # Called with self._lock held
+        if not self.state_path:
+            return
+        tmp_path = f"{self.state_path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({key_id(k): v for k, v in self._state.items()}, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError:
+            pass
+
+    # --- scheduling ---
+
+    def _roll_day(self, state, now):
+        today = datetime.fromtimestamp(now, timezone.utc).date().isoformat()
+        if state['day'] != today:
+            state.update(day=today, used=0)
+
+    def _is_healthy(self, api_key, now):
+        state = self._state[api_key]
+        self._roll_day(state, now)
+        if state['open_until'] > now:
+            return False
+        return state['used'] < self.daily_quota
+
+    def acquire(self, exclude=()):
+        """Reserve the best healthy key not in ``exclude``, or None."""
+        now = time.time()
+        with self._lock:
+            candidates = [k for k in self.api_keys if k not in exclude and self._is_healthy(k, now)]
+            if not candidates:
+                return None
+            best = min(candidates, key=lambda k: (self._in_flight[k], self._state[k]['used']))
+            self._in_flight[best] += 1
+            return best
+
+    def release(self, api_key, data=None, error=None):
+        """Record the outcome of a request made with ``api_key``."""
+        now = time.time()
+        with self._lock:
+            self._in_flight[api_key] -= 1
+            state = self._state[api_key]
+            self._roll_day(state, now)
+            state['used'] += 1
+
+            code = (data or {}).get('code') if (data or {}).get('status') == 'error' else None
+            if code in EXHAUSTED_CODES:
+                state['used'] = max(state['used'], self.daily_quota)
+                state['open_until'] = next_utc_midnight(now)
+            elif code in RATE_LIMITED_CODES:
+                state['open_until'] = now + RATE_LIMIT_COOLDOWN
+            elif code in DEAD_KEY_CODES:
+                state['open_until'] = now + 24 * 60 * 60
+
+            if code in REQUEST_ERROR_CODES:
+                # The key answered; the request was wrong
+                state['consecutive_errors'] = 0
+            elif error is not None or code is not None:
+                state['consecutive_errors'] += 1
+                state['last_error'] = code or type(error).__name__
+                if error is not None and state['consecutive_errors'] >= ERROR_THRESHOLD:
+                    state['open_until'] = max(state['open_until'], now + ERROR_COOLDOWN)
+            else:
+                state['consecutive_errors'] = 0
+
+            self._save()
+
+    def health(self):
+        """Per-key summary for display, with keys shown by their id only."""
+        now = time.time()
+        with self._lock:
+            return [
+                {
+                    'key': key_id(k),
+                    'healthy': self._is_healthy(k, now),
+                    'used_today': self._state[k]['used'],
+                    'remaining': max(self.daily_quota - self._state[k]['used'], 0),
+                    'in_flight': self._in_flight[k],
+                    'last_error': self._state[k]['last_error'],
+                }
+                for k in self.api_keys
+            ]
+
+
+def get_everything(params, scheduler, url=EVERYTHING_URL):
+    """Query /v2/everything at ``url``, trying healthy keys until one answers ok.
+
+    Returns the response JSON, or None if every usable key failed.
+    """
+    tried = set()
+    while True:
+        api_key = scheduler.acquire(exclude=tried)
+        if api_key is None:
+            return None
+        tried.add(api_key)
+        try:
+            data = get_json(url, {**params, 'apiKey': api_key},
+                            retry_statuses=SERVER_ERROR_STATUSES)
+        except (requests.RequestException, ValueError) as e:
+            scheduler.release(api_key, error=e)
+            continue
+        scheduler.release(api_key, data=data)
+        if data.get('status') == 'ok':
+            return data
+        if data.get('code') in REQUEST_ERROR_CODES:
+            note_request_error(params, data)
+            return None
+
+
+def note_request_error(params, data):
+    """Learn ``RESULTS_CAP`` from a page refused with maximumResultsReached."""
+    global RESULTS_CAP
+    if data.get('code') != 'maximumResultsReached':
+        return
+    served = (params.get('page', 1) - 1) * params.get('pageSize', PAGE_SIZE)
+    if RESULTS_CAP is None or served < RESULTS_CAP:
+        RESULTS_CAP = served
+
+
+def last_page_number(total_results, max_articles, page_size):
+    """Last page worth requesting, given ``RESULTS_CAP`` as known so far."""
+    wanted = min(total_results, max_articles)
+    if RESULTS_CAP is not None:
+        wanted = min(wanted, RESULTS_CAP)
+    return math.ceil(wanted / page_size)
+
+
+def next_wave(next_page, last_page):
+    """Pages to request together next.
+
+    Page 2 goes alone: on a plan that caps results it is the first page
+    refused, and every page of a refused wave would still use up key quota.
+    """
+    size = 1 if next_page == 2 else PAGE_CONCURRENCY
+    return list(range(next_page, min(next_page + size, last_page + 1)))
+
+
+_page_executor = concurrent.futures.ThreadPoolExecutor(max_workers=PAGE_CONCURRENCY * 2)
+
+
+def get_everything_paged(params, scheduler, max_articles=MAX_ARTICLES, page_size=PAGE_SIZE, url=EVERYTHING_URL):
+    """Fetch up to ``max_articles`` results for ``params`` across pages.
+
+    The first page gives ``totalResults``. Page 2 is requested on its own,
+    then the rest concurrently in waves of ``PAGE_CONCURRENCY``, never past
+    ``RESULTS_CAP``. Paging stops early once a wave reaches articles older
+    than the ``from`` date, or at the first page that fails, so the returned
+    articles never have gaps.
+
+    Returns the first page's JSON with ``articles`` replaced by the combined
+    list, or None if the first page failed.
+    """
+    first = get_everything({**params, 'pageSize': page_size, 'page': 1}, scheduler, url)
+    if first is None:
+        return None
+
+    articles = list(first.get('articles', []))
+    total_results = first.get('totalResults', 0)
+    window_start = params.get('from') or ''
+
+    def fetch_page(page):
+        return get_everything({**params, 'pageSize': page_size, 'page': page}, scheduler, url)
+
+    next_page = 2
+    while (next_page <= last_page_number(total_results, max_articles, page_size)
+           and not reached_window_start(articles, window_start)):
+        wave = next_wave(next_page, last_page_number(total_results, max_articles, page_size))
+        failed = False
+        for page_data in _page_executor.map(fetch_page, wave):
+            if page_data is None:
+                failed = True
+                break
+            articles.extend(page_data.get('articles', []))
+        if failed:
+            break
+        next_page += len(wave)
+
+    in_window = [a for a in articles if (a.get('publishedAt') or '')[:10] >= window_start]
+    return {**first, 'articles': in_window[:max_articles]}
+
+
+def reached_window_start(articles, window_start):
+    """True once the (newest-first) results have gone past ``window_start``."""
+    if not articles or not window_start:
+        return False
+    return (articles[-1].get('publishedAt') or '')[:10] < window_start
@@ -0,0 +1,117 @@
+"""asyncio fetch engine for NewsAPI.
+
+An alternative to running one blocking thread per topic: every topic, page
+and key-fallback request of a fetch runs as a coroutine on a single event
+loop, sharing one aiohttp connection pool, with a global cap on in-flight
+requests. Retry, key-scheduling and paging rules are the same as the
+threaded client in ``newsapi``, and attempts are recorded in ``newsapi.STATS``.
+"""
+import asyncio
+import time
+
+import aiohttp
+
+import newsapi
+
+DEFAULT_CONCURRENCY = 16
+
+
+class AsyncFetchEngine:
+    def __init__(self, scheduler, concurrency=DEFAULT_CONCURRENCY, max_articles=newsapi.MAX_ARTICLES,
+                 url=newsapi.EVERYTHING_URL):
+        self.scheduler = scheduler
+        self.url = url
+        self.concurrency = concurrency
+        self.max_articles = max_articles
+
+    def fetch_all(self, param_sets):
+        """Run ``get_everything_paged`` for every params dict on one event loop.
+
+        Returns the results in the same order (None for failed requests).
+        """
+        return asyncio.run(self._fetch_all(param_sets))
+
+    async def _fetch_all(self, param_sets):
+        self._limit = asyncio.Semaphore(self.concurrency)
+        timeout = aiohttp.ClientTimeout(sock_connect=newsapi.CONNECT_TIMEOUT, sock_read=newsapi.READ_TIMEOUT)
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+            return await asyncio.gather(*(self.get_everything_paged(session, params) for params in param_sets))
+
+    async def get_json(self, session, params, max_retries=newsapi.MAX_RETRIES,
+                       retry_statuses=newsapi.SERVER_ERROR_STATUSES):
+        for attempt in range(max_retries + 1):
+            retried = attempt > 0
+            async with self._limit:
+                started = time.perf_counter()
+                try:
+                    async with session.get(self.url, params=params) as response:
+                        status = response.status
+                        retry_after = response.headers.get('Retry-After')
+                        data = await response.json(content_type=None)
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    newsapi.STATS.record(time.perf_counter() - started, retried=retried)
+                    if attempt == max_retries:
+                        newsapi.STATS.record_failure()
+                        raise
+                    status = None
+            if status is None:
+                await asyncio.sleep(newsapi.backoff_delay(attempt))
+                continue
+
+            newsapi.STATS.record(time.perf_counter() - started, status, retried=retried)
+            if status in retry_statuses and attempt < max_retries:
+                await asyncio.sleep(newsapi.backoff_delay(attempt, retry_after))
+                continue
+            if status in retry_statuses:
+                newsapi.STATS.record_failure()
+            return data
+
+    async def get_everything(self, session, params):
+        tried = set()
+        while True:
+            api_key = self.scheduler.acquire(exclude=tried)
+            if api_key is None:
+                return None
+            tried.add(api_key)
+            try:
+                data = await self.get_json(session, {**params, 'apiKey': api_key})
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                self.scheduler.release(api_key, error=e)
+                continue
+            self.scheduler.release(api_key, data=data)
+            if data.get('status') == 'ok':
+                return data
+            if data.get('code') in newsapi.REQUEST_ERROR_CODES:
+                newsapi.note_request_error(params, data)
+                return None
+
+    async def get_everything_paged(self, session, params, page_size=newsapi.PAGE_SIZE):
+        first = await self.get_everything(session, {**params, 'pageSize': page_size, 'page': 1})
+        if first is None:
+            return None
+
+        articles = list(first.get('articles', []))
+        total_results = first.get('totalResults', 0)
+        window_start = params.get('from') or ''
+
+        next_page = 2
+        while (next_page <= newsapi.last_page_number(total_results, self.max_articles, page_size)
+               and not newsapi.reached_window_start(articles, window_start)):
+            wave = newsapi.next_wave(next_page, newsapi.last_page_number(total_results, self.max_articles, page_size))
+            pages = await asyncio.gather(*(
+                self.get_everything(session, {**params, 'pageSize': page_size, 'page': page})
+                for page in wave
+            ))
+            failed = False
+            for page_data in pages:
+                if page_data is None:
+                    failed = True
+                    break
+                articles.extend(page_data.get('articles', []))
+            if failed:
+                break
+            next_page += len(wave)
+
+        in_window = [a for a in articles if (a.get('publishedAt') or '')[:10] >= window_start]
+        return {**first, 'articles': in_window[:self.max_articles]}
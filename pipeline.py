@@ -0,0 +1,66 @@
+"""Streamlit-free processing stages for fetched NewsAPI articles."""
+from dedup import collapse_near_duplicates
+from text_matching import get_topic_matcher
+from topics import TOPIC_KEYWORDS
+
+
+def articles_fingerprint(articles):
+    """Cheap identity for a fetch result, stable across cache copies."""
+    return hash(tuple(a.url or a.title for a in articles))
+
+
+def classify_article(text, applied_topics, keyword_map=TOPIC_KEYWORDS):
+    return get_topic_matcher(applied_topics, keyword_map).match(text)
+
+
+def process_articles(raw_articles, applied_topics, hide_opinions, opinion_detector, keyword_map=TOPIC_KEYWORDS):
+    """Dedup → opinion filter → classify → tag sort.
+
+    Returns (processed_articles, collapsed_count). Kept articles get their
+    tags (and ``alternate_sources`` from dedup) set in place.
+    """
+    processed_articles = []
+    topic_names = tuple(dict.fromkeys(applied_topics))
+    topic_matcher = get_topic_matcher(topic_names, keyword_map)
+
+    # Collapse exact and near-duplicate (syndicated) stories into one article
+    unique_articles = collapse_near_duplicates(raw_articles)
+    collapsed_count = len(raw_articles) - len(unique_articles)
+
+    for article in unique_articles:
+        text_to_analyze = f"{article.title} {article.description}"
+
+        # Skip opinion/editorial pieces if filter is on
+        if hide_opinions and opinion_detector.is_opinion(article.title, article.description, article.url):
+            continue
+
+        # Matches come back in topic order, which is also the bitmask order
+        article_tags = topic_matcher.match(text_to_analyze)
+
+        if not article_tags:
+            continue
+
+        article.set_tags(article_tags, topic_names)
+        processed_articles.append(article)
+
+    return processed_articles, collapsed_count
+
+
+def build_topic_index(processed_articles):
+    """Inverted index of topic -> ascending positions of the articles tagged with it."""
+    index = {}
+    for position, article in enumerate(processed_articles):
+        for tag in article.computed_tags:
+            index.setdefault(tag, []).append(position)
+    return index
+
+
+def select_by_topics(topic_index, topics):
+    """Positions (in feed order) of articles tagged with every topic in ``topics``."""
+    postings = sorted((topic_index.get(topic, []) for topic in topics), key=len)
+    if not postings:
+        return []
+    selected = set(postings[0])
+    for positions in postings[1:]:
+        selected.intersection_update(positions)
+    return sorted(selected)
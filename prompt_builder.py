@@ -0,0 +1,139 @@
+"""Builds the article block of the AI Overview prompt within a token budget.
+
+Articles are ranked by how many outlets carried the story, then by recency.
+They are admitted in that order while their primary category is under its
+cap and the estimated size fits the budget; an article that does not fit
+with its content is retried without it. Admitted articles are written out in
+feed order, one line each, with content trimmed to a fixed length.
+"""
+import math
+
+DEFAULT_TOKEN_BUDGET = 24000
+# Per call when each topic is summarized separately
+DEFAULT_TOPIC_TOKEN_BUDGET = 6000
+DEFAULT_MAX_PER_CATEGORY = 25
+DEFAULT_CONTENT_CHARS = 300
+# Rough size of English prose in Gemini/GPT-style tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def trim_text(text, max_chars):
+    """``text`` cut to at most ``max_chars`` at a word boundary, with an ellipsis."""
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(' ', 1)[0].rstrip(' ,.;:')
+    return f"{cut}…"
+
+
+def prompt_line(article, content, category=None):
+    # A fixed category keeps a per-topic section's lines (and so its cache
+    # key) independent of which other topics tag the same articles
+    cat_string = category or ", ".join(article.computed_tags[:2])
+    title = article.title or "No Title"
+    desc = article.description or "No Description"
+    source_count = 1 + len(article.alternate_sources)
+    return f"Categories: [{cat_string}] | Sources: {source_count} | Title: {title} | Desc: {desc} | Content: {content}"
+
+
+def priority(article):
+    """Sort key, highest first: stories carried by more outlets, then newer ones."""
+    return (len(article.alternate_sources), article.published_at)
+
+
+def build_prompt_data(articles, token_budget=DEFAULT_TOKEN_BUDGET, max_per_category=DEFAULT_MAX_PER_CATEGORY,
+                      content_chars=DEFAULT_CONTENT_CHARS, category=None):
+    """Return (prompt_data_string, report) for ``articles`` (processed, in feed order).
+
+    Articles count against the cap of their first tag, or of ``category``
+    for all of them when given; ``category`` is then also the only category
+    written on each line.
+
+    ``report`` has the estimated token count and budget, how many articles
+    were included, how many had content trimmed or omitted, and the articles
+    left out per category by the cap and by the budget.
+    """
+    ranked = sorted(range(len(articles)), key=lambda i: priority(articles[i]), reverse=True)
+
+    lines = {}
+    per_category = {}
+    used_tokens = 0
+    trimmed = 0
+    content_omitted = 0
+    dropped_by_cap = {}
+    dropped_by_budget = {}
+
+    for i in ranked:
+        article = articles[i]
+        tags = article.computed_tags
+        article_category = category or (tags[0] if tags else "Uncategorized")
+        if per_category.get(article_category, 0) >= max_per_category:
+            dropped_by_cap[article_category] = dropped_by_cap.get(article_category, 0) + 1
+            continue
+
+        content = trim_text(article.content, content_chars) if article.content else "No Content"
+        line = prompt_line(article, content, category)
+        # +1 for the newline joining it to the previous line
+        cost = estimate_tokens(line) + 1
+        if used_tokens + cost > token_budget and article.content:
+            content = "No Content"
+            line = prompt_line(article, content, category)
+            cost = estimate_tokens(line) + 1
+        if used_tokens + cost > token_budget:
+            dropped_by_budget[article_category] = dropped_by_budget.get(article_category, 0) + 1
+            continue
+
+        if article.content and content == "No Content":
+            content_omitted += 1
+        elif article.content and content != article.content:
+            trimmed += 1
+        lines[i] = line
+        used_tokens += cost
+        per_category[article_category] = per_category.get(article_category, 0) + 1
+
+    prompt_data_string = "\n".join(lines[i] for i in sorted(lines))
+    report = {
+        'estimated_tokens': estimate_tokens(prompt_data_string),
+        'token_budget': token_budget,
+        'included': len(lines),
+        'total': len(articles),
+        'content_trimmed': trimmed,
+        'content_omitted': content_omitted,
+        'dropped_by_cap': dropped_by_cap,
+        'dropped_by_budget': dropped_by_budget,
+    }
+    return prompt_data_string, report
+
+
+def merge_reports(reports):
+    """Combine the reports of several ``build_prompt_data`` calls into one."""
+    merged = {
+        'estimated_tokens': 0, 'token_budget': 0, 'included': 0, 'total': 0,
+        'content_trimmed': 0, 'content_omitted': 0, 'dropped_by_cap': {}, 'dropped_by_budget': {},
+    }
+    for report in reports:
+        for key, value in report.items():
+            if isinstance(value, dict):
+                for cat, n in value.items():
+                    merged[key][cat] = merged[key].get(cat, 0) + n
+            else:
+                merged[key] += value
+    return merged
+
+
+def describe_report(report):
+    """One-line human summary of a ``build_prompt_data`` report."""
+    parts = [
+        f"Prompt ≈ {report['estimated_tokens']:,} tokens (budget {report['token_budget']:,})",
+        f"{report['included']} of {report['total']} articles included",
+    ]
+    if report['content_trimmed'] or report['content_omitted']:
+        parts.append(f"content trimmed on {report['content_trimmed']}, omitted on {report['content_omitted']}")
+    for label, key in (("over category cap", 'dropped_by_cap'), ("over token budget", 'dropped_by_budget')):
+        if report[key]:
+            by_category = ", ".join(f"{cat} {n}" for cat, n in sorted(report[key].items(), key=lambda x: -x[1]))
+            parts.append(f"{sum(report[key].values())} dropped {label} ({by_category})")
+    return " · ".join(parts)
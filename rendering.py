@@ -0,0 +1,143 @@
+"""HTML builders for feed cards and the AI Overview."""
+import html
+import re
+from datetime import datetime
+from functools import lru_cache
+
+FALLBACK_IMG = "data:image/svg+xml;base64,PHN2ZyB4bWxucz0naHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmcnIHdpZHRoPScxMjAnIGhlaWdodD0nMTIwJz48cmVjdCB3aWR0aD0nMTIwJyBoZWlnaHQ9JzEyMCcgZmlsbD0nIzFGMjkzNycvPjx0ZXh0IHg9JzUwJScgeT0nNTAlJyBmb250LXNpemU9JzQwJyB0ZXh0LWFuY2hvcj0nbWlkZGxlJyBkeT0nLjNlbSc+8J+TsDwvdGV4dD48L3N2Zz4="
+
+# The fallback thumbnail is sent once as the image column's background rather
+# than inlined into every card; a missing or broken image just hides itself.
+CARD_CSS = f'''<style>
+.img-column {{ background: #1F2937 url("{FALLBACK_IMG}") center / cover no-repeat; border-radius: 8px; }}
+.img-column img.img-missing {{ visibility: hidden; }}
+</style>'''
+
+CARD_BATCH_SIZE = 10
+
+
+def render_card(article, source_names):
+    """HTML for one feed card. ``source_names`` maps NewsAPI source ids to display names."""
+    url = article.url or "#"
+    article_tags = article.computed_tags
+    visible_tags = article_tags[:2]
+    hidden_tags = article_tags[2:]
+
+    parts = ['<div class="card-container"><div class="card-content"><div class="text-column">',
+             f'<a href="{url}" target="_blank" class="headline">{article.title}</a><div class="metadata">']
+
+    display_source = source_names.get(article.source_id, article.source_name)
+    parts.append(f'<span class="chip chip-source">{display_source}</span>')
+
+    for tag in visible_tags:
+        parts.append(f'<span class="chip chip-category">{tag}</span>')
+    if hidden_tags:
+        tooltip_text = ", ".join(hidden_tags)
+        parts.append(f'<span class="chip chip-overflow">+{len(hidden_tags)}<span class="tooltip-text">{tooltip_text}</span></span>')
+
+    iso_date = article.published_at[:10]
+    published_formatted = datetime.strptime(iso_date, '%Y-%m-%d').strftime('%b %d') if iso_date else "Unknown Date"
+    parts.append(f'<span style="color: #6B7280; font-weight: bold;">•</span><span>{published_formatted}</span></div>')
+    parts.append(f'<p class="description-text">{article.description}</p>')
+
+    if article.alternate_sources:
+        also_links = ", ".join(
+            f'<a href="{alt_url or "#"}" target="_blank">{source_names.get(alt_id, alt_name)}</a>'
+            for alt_id, alt_name, alt_url in article.alternate_sources
+        )
+        parts.append(f'<div class="also-reported">Also reported by {also_links}</div>')
+
+    parts.append('</div>')
+    if article.image_url:
+        parts.append(f'<div class="img-column"><img src="{article.image_url}" alt="Thumbnail" onerror="this.onerror=null; this.className=\'img-missing\';"></div>')
+    else:
+        parts.append('<div class="img-column"><img class="img-missing" alt="Placeholder"></div>')
+    parts.append('</div></div>')
+    return ''.join(parts)
+
+
+def iter_card_batches(articles, source_names, batch_size=CARD_BATCH_SIZE):
+    """Yield the cards as HTML chunks of ``batch_size``, one Streamlit element each."""
+    for start in range(0, len(articles), batch_size):
+        yield ''.join(render_card(a, source_names) for a in articles[start:start + batch_size])
+
+
+# One pattern per summary line: a header, a rule, a list item, a line that is
+# all bold (shown as a header) or, failing those, a paragraph.
+_MD_LINE = re.compile(
+    r'(?P<hashes>#{1,4}) (?P<heading>.*)'
+    r'|(?P<rule>---|\*\*\*|___)'
+    r'|[-*•] (?P<item>.*)'
+    r'|\*\*(?P<bold_line>[^*]+)\*\*'
+)
+# Bold or italic: an opening marker and the same marker closing it.
+# Underscores only count at word edges, so snake_case stays as is; that
+# needs lookarounds, which are slow, so they get their own pattern.
+_MD_INLINE = re.compile(r'(\*\*|\*)(.+?)\1')
+_MD_INLINE_UNDERSCORE = re.compile(r'(?<!\w)(__?)(.+?)\1(?!\w)')
+_MD_BOLD_MARKERS = re.compile(r'\*\*(.+?)\*\*')
+MD_CACHE_SIZE = 64
+
+
+def _md_tag(match):
+    marker, inner = match.groups()
+    tag = 'strong' if len(marker) == 2 else 'em'
+    return f'<{tag}>{match.re.sub(_md_tag, inner)}</{tag}>'
+
+
+def _md_inline(text):
+    """Escape ``text`` and turn its bold/italic markers into tags."""
+    text = html.escape(text)
+    if '*' in text:
+        text = _MD_INLINE.sub(_md_tag, text)
+    if '_' in text:
+        text = _MD_INLINE_UNDERSCORE.sub(_md_tag, text)
+    return text
+
+
+def render_markdown(text):
+    """Markdown subset used by the AI summary (headers, rules, bullet lists,
+    bold and italic) to HTML, in one pass over the lines. Everything from the
+    model is escaped, so only the tags produced here reach the page."""
+    html_lines = []
+    in_list = False
+
+    for line in text.split('\n'):
+        stripped = line.strip()
+        match = _MD_LINE.fullmatch(stripped)
+        is_item = match is not None and match.group('item') is not None
+
+        if in_list and not is_item:
+            html_lines.append('</ul>')
+            in_list = False
+
+        if not stripped:
+            html_lines.append('')
+        elif match is None:
+            html_lines.append(f'<p>{_md_inline(stripped)}</p>')
+        elif is_item:
+            if not in_list:
+                html_lines.append('<ul>')
+                in_list = True
+            html_lines.append(f'<li>{_md_inline(match.group("item").strip())}</li>')
+        elif match.group('hashes'):
+            level = len(match.group('hashes'))
+            heading = _MD_BOLD_MARKERS.sub(r'\1', match.group('heading').strip())
+            html_lines.append(f'<h{level}>{html.escape(heading)}</h{level}>')
+        elif match.group('rule'):
+            html_lines.append('<hr>')
+        else:
+            html_lines.append(f'<h2>{html.escape(match.group("bold_line"))}</h2>')
+
+    if in_list:
+        html_lines.append('</ul>')
+
+    return '\n'.join(html_lines)
+
+
+@lru_cache(maxsize=MD_CACHE_SIZE)
+def md_to_html(text):
+    """``render_markdown``, memoized per summary text: reruns and other
+    sessions showing the same summary reuse the HTML. Use ``render_markdown``
+    for text that keeps changing, such as a summary still streaming in."""
+    return render_markdown(text)
@@ -0,0 +1,55 @@
+"""Coalesce concurrent identical work into one in-flight computation.
+
+When several sessions miss a cache at the same moment, only the first caller
+for a key (the leader) does the work; the others wait for its result, or its
+exception, instead of repeating the same upstream request. A key is only in
+flight while its leader is running; later callers are expected to find the
+result in whatever cache sits in front.
+"""
+import concurrent.futures
+import threading
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def claim(self, key):
+        """Return (future, is_leader). The leader must call ``resolve(key, ...)``."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.followers += 1
+                return future, False
+            future = concurrent.futures.Future()
+            self._calls[key] = future
+            self.leaders += 1
+            return future, True
+
+    def resolve(self, key, result=None, error=None):
+        with self._lock:
+            future = self._calls.pop(key)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key, fn):
+        """Run ``fn()`` for ``key`` unless an identical call is in flight; return its result."""
+        future, is_leader = self.claim(key)
+        if not is_leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            self.resolve(key, error=e)
+            raise
+        self.resolve(key, result)
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {'leaders': self.leaders, 'followers': self.followers, 'in_flight': len(self._calls)}
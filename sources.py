@@ -0,0 +1,24 @@
+"""NewsAPI sources offered in the app, with their display names."""
+
+SOURCE_MAPPING = {
+    'reuters': 'Reuters',
+    'associated-press': 'Associated Press',
+    'bloomberg': 'Bloomberg',
+    'axios': 'Axios',
+    'politico': 'Politico',
+    'the-verge': 'The Verge',
+    'bbc-news': 'BBC News',
+    'al-jazeera-english': 'Al Jazeera',
+    'the-wall-street-journal': 'WSJ',
+    'cnbc': 'CNBC',
+    'business-insider': 'Business Insider',
+    'financial-post': 'Financial Post',
+    'techcrunch': 'TechCrunch',
+    'wired': 'Wired',
+    'ars-technica': 'Ars Technica',
+    'hacker-news': 'Hacker News'
+}
+REVERSE_MAPPING = {v: k for k, v in SOURCE_MAPPING.items()}
+NEUTRAL_SOURCES = ['reuters', 'associated-press', 'bloomberg', 'axios', 'politico']
+# Selected when a session starts
+DEFAULT_SOURCES = [src for src in SOURCE_MAPPING.keys() if src not in ('wired', 'hacker-news', 'ars-technica')]
@@ -0,0 +1,197 @@
+"""Gemini prompts and the map-reduce AI Overview.
+
+The map step summarizes each topic's articles in its own small model call,
+concurrently, and caches the result under that topic's prompt data, so a
+topic whose articles did not change is never summarized twice. The reduce
+step needs no model: every section is already a ``## Topic`` block in the
+requested style, and they are joined in topic order.
+
+Nothing here imports Streamlit; the caller supplies the ``generate(prompt)``
+function and the cache (``SummaryCache`` here, or ``summary_store.SummaryStore``
+to share it across processes).
+"""
+import concurrent.futures
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import prompt_builder
+
+DEFAULT_CONCURRENCY = 6
+
+BRIEF_STYLE = """Provide a concise executive briefing.
+For each category, use a ## header with the category name, then write 2-4 bullet points capturing the most important developments.
+Each bullet should be one clear, informative sentence. Bold key names, companies, and figures.
+Keep the entire summary focused and scannable. Use markdown formatting (## headers, bullet points, **bold**) for readability."""
+
+DETAILED_STYLE = """Provide a DETAILED, comprehensive briefing.
+For each category, use a ## header with the category name, then cover all major stories with context, implications, and relevant details.
+Use bullet points for individual stories with **bold** lead-ins. Include sub-bullets where appropriate.
+Be thorough but stay organized and readable. Use markdown formatting (## headers, bullet points, **bold**) for readability."""
+
+BRIEF_TOPIC_STYLE = """Write 2-4 bullet points capturing the most important developments.
+Each bullet should be one clear, informative sentence. Bold key names, companies, and figures."""
+
+DETAILED_TOPIC_STYLE = """Cover all major stories with context, implications, and relevant details.
+Use bullet points for individual stories with **bold** lead-ins. Include sub-bullets where appropriate."""
+
+_LEADING_HEADER = re.compile(r'\A\s*#{1,6} [^\n]*\n+')
+
+
+def summary_prompt(prompt_data_string, date_context, summary_mode="brief"):
+    style_instructions = BRIEF_STYLE if summary_mode == "brief" else DETAILED_STYLE
+    return f'''You are a professional news briefing assistant.
+The following news articles were published between {date_context}.
+I am providing you with a list of current news articles. Each article includes its assigned Categories, Title, and Description.
+
+{style_instructions}
+
+Group the insights by Category. Use markdown formatting (headers, bullet points) for readability.
+
+Here is the news data:
+{prompt_data_string}
+'''
+
+
+def topic_summary_prompt(topic, prompt_data_string, date_context, summary_mode="brief"):
+    style_instructions = BRIEF_TOPIC_STYLE if summary_mode == "brief" else DETAILED_TOPIC_STYLE
+    return f'''You are a professional news briefing assistant.
+The following news articles about {topic} were published between {date_context}.
+Each article includes its assigned Categories, Title, and Description.
+
+Summarize the {topic} news only. Do not add a header or an introduction.
+{style_instructions}
+Use markdown bullet points and **bold**.
+
+Here is the news data:
+{prompt_data_string}
+'''
+
+
+def content_key(prompt_data_string, date_context, summary_mode, topic=None):
+    """Hash identifying a summary by what it summarizes.
+
+    The prompt data is normalized to its set of article lines with
+    whitespace collapsed, so the same articles in a different order map to
+    the same summary.
+    """
+    lines = sorted({' '.join(line.split()) for line in prompt_data_string.splitlines() if line.strip()})
+    payload = json.dumps([topic, summary_mode, date_context, lines], ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class SummaryCache:
+    """Thread-safe in-memory LRU of finished summaries."""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        return None
+
+    def put(self, key, text):
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'bytes': sum(len(text.encode()) for text in self._entries.values()),
+            }
+
+
+def articles_by_topic(articles, topics):
+    """Topic -> its tagged articles in feed order, for the topics that have any."""
+    groups = {topic: [] for topic in dict.fromkeys(topics)}
+    for article in articles:
+        for tag in article.computed_tags:
+            if tag in groups:
+                groups[tag].append(article)
+    return {topic: group for topic, group in groups.items() if group}
+
+
+def plan_topic_sections(articles, topics, **budget):
+    """[(topic, prompt_data_string, report)] for the map step.
+
+    ``budget`` is passed to ``prompt_builder.build_prompt_data`` and applies
+    to each topic on its own, so one topic's prompt does not depend on which
+    other topics are selected.
+    """
+    sections = []
+    for topic, group in articles_by_topic(articles, topics).items():
+        prompt_data_string, report = prompt_builder.build_prompt_data(group, category=topic, **budget)
+        sections.append((topic, prompt_data_string, report))
+    return sections
+
+
+def section_markdown(topic, text):
+    """``text`` under a ``## topic`` header, replacing any header the model added."""
+    return f"## {topic}\n{_LEADING_HEADER.sub('', text.strip(), count=1)}\n"
+
+
+def map_reduce_summary(sections, date_context, summary_mode, generate, cache, timing,
+                       max_workers=DEFAULT_CONCURRENCY, single_flight=None):
+    """Yield the briefing one topic section at a time, in topic order.
+
+    Uncached sections are generated concurrently with ``generate(prompt)``
+    and stored in ``cache`` on success. With a ``singleflight.SingleFlight``,
+    a section another caller is already generating is waited on instead of
+    generated again. ``timing`` receives
+    ``first_token_s`` (first section ready), ``total_s``, ``calls`` (model
+    calls made), ``cached_sections`` and ``cached`` (nothing had to be
+    generated).
+    """
+    started = time.perf_counter()
+    timing.update(calls=0, cached_sections=0, cached=False)
+
+    def generate_section(key, topic, prompt_data_string):
+        def produce():
+            text = generate(topic_summary_prompt(topic, prompt_data_string, date_context, summary_mode))
+            cache.put(key, text)
+            return text
+
+        try:
+            return single_flight.do(key, produce) if single_flight else produce()
+        except Exception as e:
+            return f"⚠️ An error occurred while summarizing {topic}: {e}"
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = []
+        for topic, prompt_data_string, _ in sections:
+            key = content_key(prompt_data_string, date_context, summary_mode, topic)
+            text = cache.get(key)
+            if text is not None:
+                timing['cached_sections'] += 1
+                pending.append((topic, text))
+            else:
+                timing['calls'] += 1
+                pending.append((topic, executor.submit(generate_section, key, topic, prompt_data_string)))
+
+        for topic, result in pending:
+            text = result.result() if isinstance(result, concurrent.futures.Future) else result
+            if 'first_token_s' not in timing:
+                timing['first_token_s'] = time.perf_counter() - started
+            yield section_markdown(topic, text) + "\n"
+
+    timing['cached'] = timing['calls'] == 0
+    timing['total_s'] = time.perf_counter() - started
+    timing.setdefault('first_token_s', timing['total_s'])
@@ -0,0 +1,84 @@
+"""On-disk cache of finished AI Overview summaries.
+
+Entries are keyed by ``summarizer.content_key`` (a hash of the normalized
+article set, mode and date context), so any session, restart or replica that
+points at the same database file gets an identical briefing without another
+model call. The total size of stored text is bounded; the least recently
+used entries are evicted first.
+"""
+import sqlite3
+import threading
+import time
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS summaries (
+    key       TEXT PRIMARY KEY,
+    text      TEXT NOT NULL,
+    size      INTEGER NOT NULL,
+    created   REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits      INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS summaries_last_used ON summaries (last_used);
+'''
+
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+class SummaryStore:
+    """Same ``get``/``put``/``stats`` interface as ``summarizer.SummaryCache``."""
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._write_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key):
+        with self._connect() as conn:
+            row = conn.execute('SELECT text FROM summaries WHERE key = ?', (key,)).fetchone()
+        with self._stats_lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        with self._write_lock, self._connect() as conn:
+            conn.execute('UPDATE summaries SET last_used = ?, hits = hits + 1 WHERE key = ?', (time.time(), key))
+        return row[0]
+
+    def put(self, key, text):
+        now = time.time()
+        size = len(text.encode())
+        with self._write_lock, self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO summaries (key, text, size, created, last_used) VALUES (?, ?, ?, ?, ?)',
+                (key, text, size, now, now),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn):
+        # Called with self._write_lock held
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM summaries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in conn.execute('SELECT key, size FROM summaries ORDER BY last_used'):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        conn.executemany('DELETE FROM summaries WHERE key = ?', evicted)
+
+    def stats(self):
+        with self._connect() as conn:
+            entries, size = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM summaries').fetchone()
+        with self._stats_lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': entries, 'bytes': size}
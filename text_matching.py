@@ -0,0 +1,160 @@
+"""Precompiled keyword matchers for tagging articles with topics."""
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+_WORD_CHAR = re.compile(r'\w')
+
+
+def _boundary_inside(keyword, index):
+    """Whether ``\\b`` holds between keyword[index - 1] and keyword[index]."""
+    if index == 0:
+        return True
+    return bool(_WORD_CHAR.match(keyword[index - 1])) != bool(_WORD_CHAR.match(keyword[index]))
+
+
+def topic_pattern(keywords):
+    """Regex matching when any one ``\\b{kw}\\b`` of ``keywords`` would."""
+    return r'\b(?:' + '|'.join(re.escape(kw) for kw in keywords) + r')\b'
+
+
+class TopicMatcher:
+    """Tags text with every topic that has a whole-word keyword hit.
+
+    All keywords of all topics are compiled into one alternation inside a
+    lookahead, longest first, so a single ``finditer`` pass reports the longest
+    keyword matching at each position, overlapping hits included. Shorter
+    keywords that are word-bounded prefixes of it match at the same position
+    too, so their topics are folded into that keyword's topic set up front.
+    The result is the same as testing ``\\b{kw}\\b`` for every keyword.
+    """
+
+    def __init__(self, topic_keywords):
+        self.topics = [topic for topic, _ in topic_keywords]
+
+        keyword_topics = {}
+        for topic, keywords in topic_keywords:
+            for kw in keywords:
+                keyword_topics.setdefault(kw, set()).add(topic)
+
+        self._topics_for = {}
+        for kw in keyword_topics:
+            topics = set(keyword_topics[kw])
+            for i in range(len(kw)):
+                prefix = kw[:i]
+                if prefix in keyword_topics and _boundary_inside(kw, i):
+                    topics |= keyword_topics[prefix]
+            self._topics_for[kw] = topics
+
+        ordered = sorted(keyword_topics, key=len, reverse=True)
+        alternation = '|'.join(re.escape(kw) for kw in ordered)
+        self._pattern = re.compile(r'\b(?=(' + alternation + r')\b)') if ordered else None
+
+    def match(self, text):
+        """Return matching topics in topic order."""
+        if self._pattern is None:
+            return []
+        found = set()
+        for m in self._pattern.finditer(text.lower()):
+            found |= self._topics_for[m.group(1)]
+            if len(found) == len(self.topics):
+                break
+        return [topic for topic in self.topics if topic in found]
+
+
+@lru_cache(maxsize=32)
+def _compiled_matcher(topic_keywords):
+    return TopicMatcher(topic_keywords)
+
+
+def get_topic_matcher(topics, keyword_map):
+    """Matcher for ``topics``, compiled once per distinct topic set.
+
+    Topics missing from ``keyword_map`` match on their own lowercased name.
+    """
+    topic_keywords = tuple(
+        (topic, tuple(keyword_map.get(topic, [topic.lower()])))
+        for topic in dict.fromkeys(topics)
+    )
+    return _compiled_matcher(topic_keywords)
+
+
+# Phrases that mark opinion, editorial and review pieces
+OPINION_SIGNALS = [
+    r'\bopinion\b', r'\beditorial\b', r'\bop-ed\b', r'\boped\b',
+    r'\bcolumn\b', r'\bcolumnist\b', r'\bcommentary\b',
+    r'\bperspective\b', r'\banalysis\b', r'\bletter to the editor\b',
+    r'\breview[:\s]', r'\ba sharp take\b', r'\btake on\b',
+    r'\bwhy you should\b', r'\bwhy i\b', r'\bhere\'s why\b',
+    r'\bwhat .+ gets (right|wrong)\b', r'\bthe case (for|against)\b',
+    r'\bshould you\b', r'\bworth watching\b', r'\bworth reading\b',
+    r'\bfirst look\b', r'\bhands-on\b', r'\bhands on\b',
+    r'\bi think\b', r'\bin my view\b', r'\bin my opinion\b',
+    r'\brant\b', r'\bhot take\b', r'\bunpopular opinion\b',
+]
+
+
+class OpinionDetector:
+    """Checks title + description against all opinion signals in one pass.
+
+    The signals are compiled into a single alternation of named groups (with
+    their shared leading ``\b`` factored out), so one ``search`` decides the
+    article and ``lastgroup`` says which signal fired (the one matching
+    earliest in the text). Verdicts are memoized per article URL, and
+    per-signal hit counts are kept so signals that never fire can be found
+    and pruned.
+    """
+
+    def __init__(self, signals, memo_size=10000):
+        self.signals = list(signals)
+        self._pattern = self._compile(self.signals)
+        self._memo = OrderedDict()
+        self._memo_size = memo_size
+        self._lock = threading.Lock()
+        self.signal_hits = [0] * len(self.signals)
+        self.checked = 0
+        self.memo_hits = 0
+
+    @staticmethod
+    def _compile(signals):
+        # A leading \b on every alternative makes the engine try each branch
+        # at every character; factored out, only word starts are tried.
+        bounded = [f'(?P<s{i}>{p[2:]})' for i, p in enumerate(signals) if p.startswith(r'\b')]
+        unbounded = [f'(?P<s{i}>{p})' for i, p in enumerate(signals) if not p.startswith(r'\b')]
+        alternatives = ([r'\b(?:' + '|'.join(bounded) + ')'] if bounded else []) + unbounded
+        return re.compile('|'.join(alternatives))
+
+    @property
+    def pattern(self):
+        return self._pattern
+
+    def is_opinion(self, title, description, url=None):
+        if url:
+            with self._lock:
+                if url in self._memo:
+                    self._memo.move_to_end(url)
+                    self.memo_hits += 1
+                    return self._memo[url]
+
+        match = self._pattern.search(f"{title} {description}".lower())
+        verdict = match is not None
+
+        with self._lock:
+            self.checked += 1
+            if match:
+                self.signal_hits[int(match.lastgroup[1:])] += 1
+            if url:
+                self._memo[url] = verdict
+                if len(self._memo) > self._memo_size:
+                    self._memo.popitem(last=False)
+        return verdict
+
+    def stats(self):
+        """Hit counts per signal, most frequent first."""
+        with self._lock:
+            return {
+                'checked': self.checked,
+                'memo_hits': self.memo_hits,
+                'signals': sorted(zip(self.signals, self.signal_hits), key=lambda x: -x[1]),
+            }
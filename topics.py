@@ -0,0 +1,38 @@
+"""Default topics and the keyword expansion used to query and tag them."""
+
+DEFAULT_TOPICS = [
+    "Tech", "AI", "Stocks", "Politics", "Epstein", "Nuclear"
+]
+
+# --- KEYWORD EXPANSION ---
+TOPIC_KEYWORDS = {
+    "Tech": [
+        "tech", "technology", "software", "hardware", "startup",
+        "silicon valley", "app", "semiconductor", "cybersecurity", "cloud computing"
+    ],
+    "AI": [
+        "ai", "artificial intelligence", "machine learning", "llm",
+        "openai", "chatgpt", "deep learning", "neural network",
+        "anthropic", "gemini", "large language model", "generative ai"
+    ],
+    "Stocks": [
+        "stocks", "stock market", "equities", "s&p", "nasdaq",
+        "dow jones", "shares", "earnings", "ipo", "wall street",
+        "federal reserve", "interest rates", "hedge fund", "market rally"
+    ],
+    "Politics": [
+        "politics", "election", "congress", "senate",
+        "house of representatives", "white house", "legislation",
+        "biden", "trump", "democrat", "republican", "gop",
+        "governor", "ballot", "campaign", "executive order"
+    ],
+    "Epstein": [
+        "epstein", "jeffrey epstein", "ghislaine maxwell",
+        "epstein files", "epstein list"
+    ],
+    "Nuclear": [
+        "nuclear", "uranium", "reactor", "warhead",
+        "nonproliferation", "iaea", "fission", "nuclear weapon",
+        "nuclear energy", "nuclear deal", "enrichment"
+    ],
+}
@@ -0,0 +1,78 @@
+"""Background scheduler that keeps caches warm.
+
+``CacheWarmer`` runs a job once at start and then ``interval`` seconds after
+each run, and additionally right after each day boundary so the first
+visitor of the day finds a fresh entry. For a job that refreshes cache
+entries, an interval a little under their TTL replaces each entry before it
+expires. The job reports what it did by returning a dict; the warmer adds
+timings and keeps the last result for display.
+"""
+import threading
+import time
+from datetime import datetime, timezone
+
+DEFAULT_INTERVAL = 60 * 60
+# Let the new day start before fetching it
+DAY_BOUNDARY_DELAY = 60
+
+
+class CacheWarmer:
+    def __init__(self, job, interval=DEFAULT_INTERVAL, next_day_start=None):
+        """``job()`` does one warm-up and returns a dict of details.
+
+        ``next_day_start(now)`` returns the epoch time at which the next day
+        (as the app counts days) begins.
+        """
+        self.job = job
+        self.interval = interval
+        self.next_day_start = next_day_start
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.runs = 0
+        self.last_run = None
+        self.next_run = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="cache-warmer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.run_once()
+            now = time.time()
+            next_run = now + self.interval
+            if self.next_day_start is not None:
+                next_run = min(next_run, self.next_day_start(now) + DAY_BOUNDARY_DELAY)
+            with self._lock:
+                self.next_run = next_run
+            self._stop.wait(max(next_run - time.time(), 0))
+
+    def run_once(self):
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            details = self.job() or {}
+            error = None
+        except Exception as e:
+            details = {}
+            error = f"{type(e).__name__}: {e}"
+        result = {
+            **details,
+            'started_at': datetime.fromtimestamp(started_at, timezone.utc),
+            'duration_s': time.perf_counter() - started,
+            'error': error,
+        }
+        with self._lock:
+            self.runs += 1
+            self.last_run = result
+        return result
+
+    def status(self):
+        with self._lock:
+            return {'runs': self.runs, 'last_run': self.last_run, 'next_run': self.next_run}